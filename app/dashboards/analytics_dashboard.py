@@ -17,8 +17,11 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select, literal, union, union_all
 import json
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 import base64
 from scipy import stats
 from sklearn.preprocessing import StandardScaler
@@ -29,16 +32,20 @@ import sys
 
 # Import du détecteur de statut
 try:
-    from .status_detector import detect_listing_status
+    from .status_detector import detect_listing_status, detect_listing_status_vectorized
 except ImportError:
     try:
-        from status_detector import detect_listing_status
+        from status_detector import detect_listing_status, detect_listing_status_vectorized
     except ImportError:
         # Fallback si module non disponible
         def detect_listing_status(title=None, price=None, property_type=None, source=None, native_status=None):
             if price and price < 1_500_000:
                 return 'Location'
             return 'Vente'
+        
+        def detect_listing_status_vectorized(titles=None, prices=None, property_types=None, sources=None, native_statuses=None):
+            prices = pd.to_numeric(pd.Series(prices), errors='coerce').to_numpy()
+            return np.where((prices != 0) & (prices < 1_500_000), 'Location', 'Vente')
 
 warnings.filterwarnings('ignore')
 
@@ -242,7 +249,87 @@ class AnalyticsDashboard:
         'text_primary': '#1E293B', 'text_secondary': '#64748B', 'border': '#E2E8F0'
     }
     
+    # Palette des séries par type de bien, et ses remplissages semi-transparents (calculés une fois)
+    TYPE_PALETTE = (COLORS['primary'], COLORS['secondary'], COLORS['success'], COLORS['warning'], COLORS['info'])
+    TYPE_PALETTE_FILL = tuple(
+        f'rgba({int(c[1:3], 16)}, {int(c[3:5], 16)}, {int(c[5:7], 16)}, 0.6)' for c in TYPE_PALETTE
+    )
+    
+    # Styles partagés par référence (construits une fois, jamais modifiés)
+    GRAPH_STYLE = {
+        'background': 'white',
+        'padding': '24px',
+        'borderRadius': '20px',
+        'boxShadow': '0 4px 20px rgba(0,0,0,0.06)',
+        'border': f'1px solid {COLORS["border"]}'
+    }
+    GRAPH_CONFIG = {'displayModeBar': False}
+    # Plafonds de points pour les graphiques de distribution brute
+    PLOT_SAMPLE_SIZE = 500
+    BUBBLE_SAMPLE_SIZE = 300
+    VIOLIN_SAMPLE_SIZE = 2000
+    # Nombre max de dates par courbe de tendance (au-delà : agrégation hebdo puis mensuelle)
+    TREND_MAX_POINTS = 200
+    # Cache des chargements : nombre de jeux de filtres gardés et durée de validité (secondes)
+    DATA_CACHE_SIZE = 16
+    DATA_CACHE_TIMEOUT = 300
+    # Threads de construction des graphiques (pandas/NumPy relâchent le GIL)
+    FIGURE_WORKERS = 4
+    # Nombre de matrices de corrélation gardées en mémoire
+    CORR_CACHE_SIZE = 32
+    # Nombre de jeux de 8 figures gardés en mémoire
+    FIGURE_CACHE_SIZE = 16
+    # Mise en page commune à tous les graphiques (fond blanc, titre Outfit aligné à gauche)
+    BASE_LAYOUT = {'plot_bgcolor': 'white', 'paper_bgcolor': 'white'}
+    TITLE_FONT = {'size': 20, 'family': 'Outfit, sans-serif'}
+    EMPTY_GRAPHS_STYLE = {
+        'textAlign': 'center', 'padding': '40px',
+        'background': 'white', 'borderRadius': '20px',
+        'boxShadow': '0 4px 20px rgba(0,0,0,0.06)',
+        'color': COLORS['warning']
+    }
+    EMPTY_KPIS_STYLE = {'textAlign': 'center', 'padding': '40px', 'color': COLORS['text_secondary']}
+    # Composant d'erreur : styles fixes, seuls le titre et le message changent
+    ERROR_BOX_STYLE = {
+        'textAlign': 'center',
+        'padding': '40px',
+        'background': 'white',
+        'borderRadius': '20px',
+        'border': f'2px solid {COLORS["danger"]}'
+    }
+    ERROR_TITLE_STYLE = {'color': COLORS['danger'], 'marginTop': '16px', 'marginBottom': '8px'}
+    ERROR_TEXT_STYLE = {'color': COLORS['text_secondary'], 'fontSize': '14px'}
+    # Cartes KPI : styles fixes (seul le bloc icône dépend de la couleur, voir kpi_icon_style)
+    KPI_CARD_STYLE = {
+        'background': 'white',
+        'borderRadius': '20px',
+        'padding': '24px',
+        'boxShadow': '0 4px 20px rgba(0,0,0,0.06)',
+        'border': f'1px solid {COLORS["border"]}',
+        'height': '100%'
+    }
+    KPI_TITLE_STYLE = {'fontSize': '13px', 'fontWeight': '500', 'color': COLORS['text_secondary'], 'marginBottom': '8px'}
+    KPI_VALUE_STYLE = {'fontSize': '26px', 'fontWeight': '700', 'color': COLORS['text_primary'], 'marginBottom': '8px'}
+    
+    # Colonnes texte à faible cardinalité, stockées en `category`
+    CATEGORY_COLUMNS = ('city', 'property_type', 'status', 'source')
+    # Colonnes numériques : float32 suffit (et garde NaN pour les valeurs manquantes)
+    FLOAT32_COLUMNS = ('price', 'surface_area', 'price_per_m2', 'bedrooms', 'bathrooms', 'age_days')
+    
     def __init__(self, server=None, routes_pathname_prefix="/analytics/", requests_pathname_prefix="/analytics/"):
+        # Matrices de corrélation déjà calculées (LRU), par (version des données, colonnes)
+        self._corr_cache = OrderedDict()
+        # DataFrames enrichis déjà chargés, par filtres (LRU + expiration)
+        self._data_cache = OrderedDict()
+        # Figures déjà construites, par version des données (filtres + statut + chargement)
+        self._figure_cache = OrderedDict()
+        # Options des filtres (villes / types) tirées de SELECT DISTINCT : (horodatage, options)
+        self._options_cache = (datetime.min, None)
+        # États vides / icône d'erreur construits une fois et réutilisés par les callbacks
+        self._empty_graphs = html.Div("Aucune donnée - Vérifiez les filtres (notamment le STATUT)", style=self.EMPTY_GRAPHS_STYLE)
+        self._empty_kpis = html.Div("Aucune donnée disponible", style=self.EMPTY_KPIS_STYLE)
+        self._error_icon = DashIconify(icon="mdi:alert-circle", width=48, color=self.COLORS['danger'])
+        self._figure_executor = ThreadPoolExecutor(max_workers=self.FIGURE_WORKERS, thread_name_prefix='analytics-figures')
         # CSS personnalisé
         self.custom_css = """
         * { font-family: 'Outfit', sans-serif; }
@@ -275,13 +362,14 @@ class AnalyticsDashboard:
             routes_pathname_prefix=routes_pathname_prefix,
             requests_pathname_prefix=requests_pathname_prefix,
             suppress_callback_exceptions=True,
+            # Pas de "Updating..." dans l'onglet à chaque callback
+            update_title=None,
             meta_tags=[{
                 "name": "viewport",
                 "content": "width=device-width, initial-scale=1, maximum-scale=1"
             }]
         )
         
-        self._data_cache = {}
         self._debug_mode = True
         
         # CRITIQUE: Configuration du layout AVANT les callbacks
@@ -339,6 +427,45 @@ class AnalyticsDashboard:
                 'message': traceback.format_exc()
             }
     
+    def cached_enriched_data(self, filters=None, limit=5000):
+        """get_enriched_data mémorisé par (filtres, limite) : le DataFrame renvoyé ne doit pas être modifié
+        
+        Retourne (df, version) ; la version (horodatage du chargement) change à chaque rechargement en base.
+        """
+        filters = filters or {}
+        key = (
+            tuple(filters.get('cities') or ()),
+            tuple(filters.get('property_types') or ()),
+            tuple(filters.get('price_range') or ()),
+            limit
+        )
+        entry = self._data_cache.get(key)
+        if entry is not None and datetime.now() - entry[0] < timedelta(seconds=self.DATA_CACHE_TIMEOUT):
+            self._data_cache.move_to_end(key)
+            return entry[1], entry[0].isoformat()
+        
+        df = self.get_enriched_data(filters=filters or None, limit=limit)
+        loaded_at = datetime.now()
+        if not df.empty:
+            self._data_cache[key] = (loaded_at, df)
+            self._data_cache.move_to_end(key)
+            while len(self._data_cache) > self.DATA_CACHE_SIZE:
+                self._data_cache.popitem(last=False)
+        return df, loaded_at.isoformat()
+    
+    # Libellé des annonces sans ville (identique au dashboard principal)
+    MISSING_CITY = 'non spécifié'
+    
+    @staticmethod
+    def city_key(model):
+        """Ville normalisée en SQL (minuscules, partie avant la virgule) : expression de l'index *_city_norm (migration 004)"""
+        return func.lower(func.split_part(model.city, ',', 1))
+    
+    @classmethod
+    def city_column(cls, model):
+        """Colonne ville sélectionnée : ville normalisée, MISSING_CITY si absente"""
+        return func.coalesce(cls.city_key(model), cls.MISSING_CITY).label('city')
+    
     def get_enriched_data(self, filters=None, limit=5000):
         """
         Récupération enrichie des données avec filtres avancés
@@ -357,92 +484,85 @@ class AnalyticsDashboard:
             except ImportError:
                 from database.models import db,  ExpatDakarProperty, LogerDakarProperty
             
-            all_data = []
+            selects = []
             
             for model in [ ExpatDakarProperty, LogerDakarProperty]:
-                try:
-                    query = db.session.query(
-                        model.city,
-                        model.property_type,
-                        model.price,
-                        model.surface_area,
-                        model.bedrooms,
-                        model.bathrooms,
-                        model.posted_time,
-                    ).filter(
-                        model.price.isnot(None),
-                        model.price > 10000,
-                        model.price < 1e10
-                    )
-                    
-                    # Appliquer les filtres
-                    if filters:
-                        if filters.get('cities') and len(filters['cities']) > 0:
-                            query = query.filter(model.city.in_(filters['cities']))
-                        
-                        if filters.get('property_types') and len(filters['property_types']) > 0:
-                            query = query.filter(model.property_type.in_(filters['property_types']))
-                        
-                        if filters.get('price_range'):
-                            min_price, max_price = filters['price_range']
-                            query = query.filter(
-                                model.price >= min_price,
-                                model.price <= max_price
-                            )
+                # Requête Core sur les seules colonnes utiles, source étiquetée en SQL
+                stmt = select(
+                    self.city_column(model),
+                    model.property_type,
+                    model.price,
+                    model.surface_area,
+                    model.bedrooms,
+                    model.bathrooms,
+                    model.posted_time,
+                    literal(model.__name__).label('source')
+                ).where(
+                    model.price.isnot(None),
+                    model.price > 10000,
+                    model.price < 1e10
+                )
+                
+                # Appliquer les filtres
+                if filters:
+                    if filters.get('cities') and len(filters['cities']) > 0:
+                        # Les options du filtre sont des villes normalisées : comparaison sur la même expression
+                        # Filtre sur l'expression indexée telle quelle (sans coalesce, sinon l'index ne sert plus)
+                        city_filter = self.city_key(model).in_(filters['cities'])
+                        if self.MISSING_CITY in filters['cities']:
+                            city_filter = or_(city_filter, model.city.is_(None))
+                        stmt = stmt.where(city_filter)
                     
-                    records = query.limit(limit).all()
+                    if filters.get('property_types') and len(filters['property_types']) > 0:
+                        stmt = stmt.where(model.property_type.in_(filters['property_types']))
                     
-                    for r in records:
-                        try:
-                            age_days = None
-                            if r.posted_time:
-                                age_days = (datetime.utcnow() - parse_french_datetime(r.posted_time)).days
-                                
-                            
-                            price = float(r.price) if r.price else 0
-                            surface = float(r.surface_area) if r.surface_area and r.surface_area > 0 else None
-                            title = str(r.title) if hasattr(r, 'title') and r.title else None
-                            prop_type = str(r.property_type) if r.property_type else 'Autre'
-                            
-                            # Détection du statut (Vente/Location)
-                            native_status = str(r.status) if hasattr(r, 'status') and r.status else None
-                            status = detect_listing_status(
-                                title=title,
-                                price=price,
-                                property_type=prop_type,
-                                source=model.__name__,
-                                native_status=native_status
-                            )
-                            
-                            record_dict = {
-                                'city': str(r.city) if r.city else 'Non spécifié',
-                                'property_type': prop_type,
-                                'status': status,  # NOUVEAU
-                                'price': price,
-                                'posted_time': r.posted_time,
-                                'surface_area': surface,
-                                'bedrooms': int(r.bedrooms) if r.bedrooms else None,
-                                'bathrooms': int(r.bathrooms) if r.bathrooms else None,
-                                'age_days': age_days,
-                                'price_per_m2': price / surface if surface and surface > 0 and price > 0 else None
-                            }
-                            
-                            all_data.append(record_dict)
-                            
-                        except Exception:
-                            continue
-                            
-                except Exception as e:
-                    print(f"Erreur requête {model.__name__}: {e}")
-                    continue
+                    if filters.get('price_range'):
+                        min_price, max_price = filters['price_range']
+                        stmt = stmt.where(
+                            model.price >= min_price,
+                            model.price <= max_price
+                        )
+                
+                # LIMIT par source conservé (sous-requête)
+                selects.append(select(stmt.limit(limit).subquery()))
+            
+            # Un seul aller-retour pour toutes les sources, lu par lots de 500 (partitions) puis concaténé
+            result = db.session.execute(union_all(*selects).execution_options(yield_per=500))
+            keys = list(result.keys())
+            frames = [pd.DataFrame(part, columns=keys) for part in result.partitions(500)]
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=keys)
             
-            if not all_data:
+            if df.empty:
                 return pd.DataFrame()
             
-            df = pd.DataFrame(all_data)
-            df['city'] = df['city'].apply(lambda x: x.lower().split(',')[0] if isinstance(x, str) else x)
+            # Nettoyage par colonne (plus de dict ni de try/except par ligne)
+            df['price'] = pd.to_numeric(df['price'], errors='coerce').fillna(0)
+            df['property_type'] = df['property_type'].fillna('Autre').astype(str)
+            df['city'] = df['city'].fillna(self.MISSING_CITY).astype(str)
+            for col in ('surface_area', 'bedrooms', 'bathrooms'):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            df['surface_area'] = df['surface_area'].where(df['surface_area'] > 0)
+            df[['bedrooms', 'bathrooms']] = df[['bedrooms', 'bathrooms']].replace(0, np.nan)
+            
+            # Détection du statut (Vente/Location) : ni titre ni statut natif sélectionnés, prix + type + source
+            df['status'] = detect_listing_status_vectorized(
+                prices=df['price'],
+                property_types=df['property_type'],
+                sources=df['source']
+            )
+            
             if 'posted_time' in df.columns:
-                df['posted_time'] = df['posted_time'].apply(parse_french_datetime)            
+                has_posted = df['posted_time'].notna() & (df['posted_time'] != '')
+                df['posted_time'] = df['posted_time'].apply(parse_french_datetime)
+                # Âge calculé sur la date déjà parsée (un seul parsing par annonce)
+                posted = pd.to_datetime(df['posted_time'], errors='coerce')
+                df['age_days'] = (pd.Timestamp(datetime.utcnow()) - posted).dt.days.where(has_posted)
+            
+            # Prix/m² calculé une fois à l'ingestion, en vectoriel (NaN si surface ou prix absents)
+            sa = df['surface_area'].to_numpy(dtype=np.float64)
+            p = df['price'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                df['price_per_m2'] = np.where((sa > 0) & (p > 0), p / sa, np.nan)
             
             # Enrichissement des données
             if not df.empty:
@@ -461,13 +581,69 @@ class AnalyticsDashboard:
                         labels=['Petit', 'Moyen', 'Grand', 'Très Grand']
                     )
             
-            return df
+            # Mélange unique et reproductible au chargement (frame mis en cache ensuite) :
+            # les graphiques échantillonnent par simple tête de groupe, sous-ensembles par statut compris
+            df = df.sample(frac=1, random_state=0).reset_index(drop=True)
+            
+            return self.optimize_dtypes(df)
             
         except Exception as e:
             print(f"Erreur globale chargement enrichi: {e}")
             traceback.print_exc()
             return pd.DataFrame()
     
+    def optimize_dtypes(self, df):
+        """Dtypes compacts : `category` pour le texte répétitif, float32 pour les nombres"""
+        if df.empty:
+            return df
+        
+        for col in self.CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        for col in self.FLOAT32_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        
+        return df
+    
+    def filter_options(self, refresh=False):
+        """Options des filtres villes / types via SELECT DISTINCT (aucune annonce chargée), mémorisées DATA_CACHE_TIMEOUT secondes"""
+        loaded_at, options = self._options_cache
+        if not refresh and options and datetime.now() - loaded_at < timedelta(seconds=self.DATA_CACHE_TIMEOUT):
+            return options
+        
+        try:
+            try:
+                from app.database.models import db, ExpatDakarProperty, LogerDakarProperty
+            except ImportError:
+                from database.models import db, ExpatDakarProperty, LogerDakarProperty
+            
+            def distinct(column):
+                # Mêmes bornes de prix que get_enriched_data : seules les valeurs réellement chargeables
+                stmt = union(*[
+                    select(column(model)).where(
+                        model.price.isnot(None),
+                        model.price > 10000,
+                        model.price < 1e10
+                    )
+                    for model in (ExpatDakarProperty, LogerDakarProperty)
+                ])
+                return db.session.execute(stmt).scalars().all()
+            
+            # Même normalisation que get_enriched_data (ville normalisée en SQL, type absent -> 'Autre')
+            cities = sorted({name for name in distinct(self.city_column) if name})
+            property_types = sorted({raw or 'Autre' for raw in distinct(lambda model: model.property_type)})
+        except Exception as e:
+            print(f"⚠️ Options de filtres indisponibles: {e}")
+            return [], []
+        
+        city_options = [{'label': f'📍 {city}', 'value': city} for city in cities]
+        type_options = [{'label': f'🏠 {ptype}', 'value': ptype} for ptype in property_types]
+        
+        self._options_cache = (datetime.now(), (city_options, type_options))
+        return city_options, type_options
+    
     def calculate_ultra_kpis(self, data):
         """Calcule des KPIs ultra-avancés"""
         if data is None or len(data) == 0:
@@ -476,32 +652,33 @@ class AnalyticsDashboard:
                 'price_volatility': 0, 'market_liquidity': 0, 'growth_rate': 0
             }
         
-        df = pd.DataFrame(data) if isinstance(data, list) else data
+        df = data if isinstance(data, pd.DataFrame) else self.optimize_dtypes(pd.DataFrame(data))
         
         kpis = {}
         
         try:
             kpis['total'] = len(df)
-            kpis['median_price'] = float(df['price'].median()) if 'price' in df.columns else 0
-            kpis['avg_price_m2'] = float(df['price_per_m2'].mean()) if 'price_per_m2' in df.columns and df['price_per_m2'].notna().sum() > 0 else 0
-            
-            # Volatilité (coefficient de variation)
-            if 'price' in df.columns and df['price'].std() > 0:
-                kpis['price_volatility'] = float((df['price'].std() / df['price'].mean()) * 100)
+            has_price = 'price' in df.columns and df['price'].notna().any()
+            kpis['median_price'] = float(df['price'].median()) if has_price else 0
+            kpis['avg_price_m2'] = float(df['price_per_m2'].mean()) if 'price_per_m2' in df.columns and df['price_per_m2'].notna().any() else 0
+            
+            # Volatilité (coefficient de variation) : écart-type calculé une seule fois
+            price_std = float(df['price'].std()) if has_price else 0
+            if price_std > 0:
+                kpis['price_volatility'] = float((price_std / df['price'].mean()) * 100)
             else:
                 kpis['price_volatility'] = 0
             
-            # Liquidité du marché (nombre d'annonces récentes)
+            # Liquidité du marché (part des annonces récentes)
             if 'age_days' in df.columns:
-                recent = df[df['age_days'] <= 30] if df['age_days'].notna().sum() > 0 else df
-                kpis['market_liquidity'] = float(len(recent) / len(df) * 100) if len(df) > 0 else 0
+                age_known = df['age_days'].notna()
+                kpis['market_liquidity'] = float((df['age_days'] <= 30).mean() * 100) if age_known.any() else 100.0
             else:
                 kpis['market_liquidity'] = 100.0
             
-            # Taux de croissance simulé (basé sur quartiles)
-            if 'price' in df.columns and df['price'].notna().sum() > 0:
-                q1 = df['price'].quantile(0.25)
-                q3 = df['price'].quantile(0.75)
+            # Taux de croissance simulé (basé sur quartiles, un seul appel quantile)
+            if has_price:
+                q1, q3 = df['price'].quantile([0.25, 0.75]).tolist()
                 kpis['growth_rate'] = float(((q3 - q1) / q1 * 100)) if q1 > 0 else 0
             else:
                 kpis['growth_rate'] = 0
@@ -519,6 +696,22 @@ class AnalyticsDashboard:
     #              GRAPHIQUES AVANCÉS - HELPERS
     # ========================================================
     
+    @staticmethod
+    def _sample_for_plot(df, max_n, by='property_type'):
+        """Échantillon stratifié par `by`, sans tirage aléatoire
+        
+        Les lignes sont déjà mélangées une fois au chargement : garder les premières
+        lignes de chaque groupe équivaut à un tirage, sans RNG ni index recopié.
+        """
+        n = len(df)
+        if n <= max_n:
+            return df
+        if by not in df.columns:
+            return df.head(max_n)
+        groups = df.groupby(by, observed=True, sort=False)
+        keep = groups.cumcount().to_numpy() < groups[by].transform('size').to_numpy() * (max_n / n)
+        return df[keep]
+    
     def _create_empty_graph(self, message, title=""):
         """Crée un graphique vide avec message"""
         fig = go.Figure()
@@ -533,33 +726,23 @@ class AnalyticsDashboard:
             title=title,
             xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
             yaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
+            **self.BASE_LAYOUT,
             height=400
         )
         return fig
     
+    def chart_title(self, text):
+        """Titre de graphique (police et alignement communs)"""
+        return {'text': text, 'font': self.TITLE_FONT, 'x': 0}
+    
     def _create_error_component(self, title, error, details):
         """Crée un composant d'erreur"""
         return html.Div([
             html.Div([
-                DashIconify(icon="mdi:alert-circle", width=48, color=self.COLORS['danger']),
-                html.H3(title, style={
-                    'color': self.COLORS['danger'],
-                    'marginTop': '16px',
-                    'marginBottom': '8px'
-                }),
-                html.P(str(error), style={
-                    'color': self.COLORS['text_secondary'],
-                    'fontSize': '14px'
-                })
-            ], style={
-                'textAlign': 'center',
-                'padding': '40px',
-                'background': 'white',
-                'borderRadius': '20px',
-                'border': f'2px solid {self.COLORS["danger"]}'
-            })
+                self._error_icon,
+                html.H3(title, style=self.ERROR_TITLE_STYLE),
+                html.P(str(error), style=self.ERROR_TEXT_STYLE)
+            ], style=self.ERROR_BOX_STYLE)
         ])
     
     # ========================================================
@@ -585,17 +768,18 @@ class AnalyticsDashboard:
             
             fig = go.Figure()
             
-            property_types = df_clean['property_type'].unique()
-            colors = [self.COLORS['primary'], self.COLORS['secondary'], 
-                     self.COLORS['success'], self.COLORS['warning'], self.COLORS['info']]
+            colors = self.TYPE_PALETTE
             
-            for i, ptype in enumerate(property_types):
-                df_type = df_clean[df_clean['property_type'] == ptype]
+            # Un seul groupby ; chaque violon plafonné (la densité est estimée dans le navigateur)
+            groups = df_clean.groupby('property_type', observed=True, sort=False)['price']
+            for i, (ptype, prices) in enumerate(groups):
+                if len(prices) > self.VIOLIN_SAMPLE_SIZE:
+                    prices = prices.sample(self.VIOLIN_SAMPLE_SIZE, random_state=0)
                 
                 # S'assurer qu'il y a des données
-                if len(df_type) > 0 and df_type['price'].notna().sum() > 0:
+                if len(prices) > 0:
                     fig.add_trace(go.Violin(
-                        y=df_type['price'].dropna(),
+                        y=prices.to_numpy(),
                         name=ptype,
                         box_visible=True,
                         meanline_visible=True,
@@ -605,14 +789,9 @@ class AnalyticsDashboard:
                     ))
             
             fig.update_layout(
-                title=dict(
-                    text='🎻 Distribution des Prix - Violin Plot',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
+                title=self.chart_title('🎻 Distribution des Prix - Violin Plot'),
                 yaxis_title="Prix (FCFA)",
-                plot_bgcolor='white',
-                paper_bgcolor='white',
+                **self.BASE_LAYOUT,
                 height=500,
                 showlegend=True,
                 legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
@@ -644,7 +823,7 @@ class AnalyticsDashboard:
             
             # Agréger par ville et tranche de surface
             df_clean['surface_bin'] = pd.cut(df_clean['surface_area'], bins=10)
-            pivot = df_clean.groupby(['city', 'surface_bin'])['price'].mean().reset_index()
+            pivot = df_clean.groupby(['city', 'surface_bin'], observed=True, sort=False)['price'].mean().reset_index()
             pivot_table = pivot.pivot(index='city', columns='surface_bin', values='price')
             
             fig = go.Figure(data=[go.Surface(
@@ -656,11 +835,7 @@ class AnalyticsDashboard:
             )])
             
             fig.update_layout(
-                title=dict(
-                    text=' Surface 3D: Prix × Surface × Ville',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
+                title=self.chart_title(' Surface 3D: Prix × Surface × Ville'),
                 scene=dict(
                     xaxis_title='Surface',
                     yaxis_title='Ville',
@@ -668,8 +843,7 @@ class AnalyticsDashboard:
                     camera=dict(eye=dict(x=1.5, y=1.5, z=1.3))
                 ),
                 height=600,
-                plot_bgcolor='white',
-                paper_bgcolor='white'
+                **self.BASE_LAYOUT
             )
             
             return fig
@@ -678,8 +852,12 @@ class AnalyticsDashboard:
             print(f"Erreur 3D surface: {e}")
             return self._create_empty_graph(f"Erreur: {str(e)}", " Surface 3D")
     
-    def create_multi_layer_heatmap(self, data):
-        """Heatmap multi-couches corrélations avancées"""
+    def create_multi_layer_heatmap(self, data, version=None):
+        """Heatmap multi-couches corrélations avancées
+        
+        `version` (chargement + filtres + statut, voir load_with_filters) identifie le jeu de données :
+        la matrice est mémorisée sous cette clé ; sans version, elle est recalculée.
+        """
         try:
             if data is None or len(data) == 0:
                 return self._create_empty_graph("Aucune donnée disponible", "🔥 Heatmap Corrélations")
@@ -692,33 +870,44 @@ class AnalyticsDashboard:
             if len(available_cols) < 2:
                 return self._create_empty_graph("Pas assez de colonnes numériques", "🔥 Heatmap Corrélations")
             
-            df_numeric = df[available_cols].dropna()
-            
-            if df_numeric.empty or len(df_numeric) < 2:
-                return self._create_empty_graph("Pas assez de données", "🔥 Heatmap Corrélations")
-            
-            corr = df_numeric.corr()
+            key = (version, tuple(available_cols))
+            corr = self._corr_cache.get(key) if version is not None else None
+            if corr is not None:
+                self._corr_cache.move_to_end(key)
+            else:
+                # Matrice float32 contiguë (colonnes déjà en float32) : pas de copie DataFrame ni de dropna pandas
+                values = df[available_cols].to_numpy(dtype=np.float32)
+                values = values[~np.isnan(values).any(axis=1)]
+                
+                if len(values) < 2:
+                    return self._create_empty_graph("Pas assez de données", "🔥 Heatmap Corrélations")
+                
+                # NaN déjà retirés : np.corrcoef évite la gestion par paires de DataFrame.corr
+                # (stockage float32, calcul en float64 pour ne pas perdre en précision sur les prix)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    corr = np.corrcoef(values, rowvar=False, dtype=np.float64)
+                if version is not None:
+                    self._corr_cache[key] = corr
+                    while len(self._corr_cache) > self.CORR_CACHE_SIZE:
+                        self._corr_cache.popitem(last=False)
             
             fig = go.Figure(data=go.Heatmap(
-                z=corr.values,
-                x=corr.columns,
-                y=corr.columns,
+                z=corr,
+                x=available_cols,
+                y=available_cols,
                 colorscale='RdBu',
                 zmid=0,
-                text=corr.values.round(2),
+                text=corr.round(2),
                 texttemplate='%{text}',
+                # Colonnes constantes -> corrélation NaN : cases vides, sans survol
+                hoverongaps=False,
                 textfont={"size": 12},
                 colorbar=dict(title="Corrélation", x=1.1)
             ))
             
             fig.update_layout(
-                title=dict(
-                    text='🔥 Matrice de Corrélation Multi-Variables',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
+                title=self.chart_title('🔥 Matrice de Corrélation Multi-Variables'),
+                **self.BASE_LAYOUT,
                 height=500,
                 xaxis=dict(tickangle=-45),
                 margin=dict(l=100, r=100, t=80, b=100)
@@ -741,49 +930,53 @@ class AnalyticsDashboard:
             if 'posted_time' not in df.columns or 'property_type' not in df.columns:
                 return self._create_empty_graph("Colonnes manquantes", " Tendances Temporelles")
             
-            df_dated = df[df['posted_time'].notna()].copy()
-            df_dated['date'] = pd.to_datetime(df_dated['posted_time'], format='mixed').dt.date
+            dates = pd.to_datetime(df['posted_time'], format='ISO8601', errors='coerce').dt.normalize()
+            has_date = dates.notna()
             
-            if df_dated.empty:
+            if not has_date.any():
                 return self._create_empty_graph("Pas de dates disponibles", " Tendances Temporelles")
             
-            df_dated['date'] = pd.to_datetime(df_dated['posted_time'], format='ISO8601', errors='coerce').dt.date
-            
-            # Compter par type et date
-            trend = df_dated.groupby(['date', 'property_type']).size().reset_index(name='count')
-            
-            # Filtrer les types avec au moins quelques données
-            trend = trend[trend['count'] > 0]
+            # Compter par date et type : une colonne par type, axe des dates commun (empilement aligné)
+            trend = (
+                df.loc[has_date, 'property_type']
+                .groupby([dates[has_date], df.loc[has_date, 'property_type']], observed=True)
+                .size()
+                .unstack(fill_value=0)
+            )
             
             if trend.empty:
                 return self._create_empty_graph("Pas assez de données", " Tendances Temporelles")
             
+            # Historique long : on agrège par semaine puis par mois plutôt que d'envoyer un point par jour
+            for rule in ('W', 'MS'):
+                if len(trend) <= self.TREND_MAX_POINTS:
+                    break
+                trend = trend.resample(rule).sum()
+            
             fig = go.Figure()
             
-            colors = [self.COLORS['primary'], self.COLORS['secondary'], 
-                     self.COLORS['success'], self.COLORS['warning'], self.COLORS['info']]
+            fills = self.TYPE_PALETTE_FILL
             
-            for i, ptype in enumerate(trend['property_type'].unique()):
-                df_type = trend[trend['property_type'] == ptype]
-                fig.add_trace(go.Scatter(
-                    x=df_type['date'],
-                    y=df_type['count'],
+            # Empilement calculé en pandas (stackgroup n'existe pas en WebGL) : aires remplies entre cumuls
+            stacked = trend.cumsum(axis=1)
+            
+            for i, ptype in enumerate(trend.columns):
+                fig.add_trace(go.Scattergl(
+                    x=trend.index,
+                    y=stacked[ptype].to_numpy(),
+                    customdata=trend[ptype].to_numpy(),
                     mode='lines',
                     name=ptype,
-                    stackgroup='one',
-                    fillcolor=f'rgba({int(colors[i % len(colors)][1:3], 16)}, {int(colors[i % len(colors)][3:5], 16)}, {int(colors[i % len(colors)][5:7], 16)}, 0.6)'
+                    fill='tozeroy' if i == 0 else 'tonexty',
+                    fillcolor=fills[i % len(fills)],
+                    hovertemplate=f"{ptype}: %{{customdata}}<extra></extra>"
                 ))
             
             fig.update_layout(
-                title=dict(
-                    text=' Évolution Temporelle des Annonces',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
+                title=self.chart_title(' Évolution Temporelle des Annonces'),
                 xaxis_title="Date",
                 yaxis_title="Nombre d'annonces",
-                plot_bgcolor='white',
-                paper_bgcolor='white',
+                **self.BASE_LAYOUT,
                 height=450,
                 hovermode='x unified',
                 legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
@@ -816,7 +1009,7 @@ class AnalyticsDashboard:
                 return self._create_empty_graph("Pas assez de données", " Coordonnées Parallèles")
             
             # Échantillonner pour performance
-            df_sample = df_clean.sample(min(500, len(df_clean)))
+            df_sample = self._sample_for_plot(df_clean, self.PLOT_SAMPLE_SIZE)
             
             # Créer le graphique
             dimensions = []
@@ -838,13 +1031,8 @@ class AnalyticsDashboard:
             ))
             
             fig.update_layout(
-                title=dict(
-                    text=' Coordonnées Parallèles Multi-Variables',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
+                title=self.chart_title(' Coordonnées Parallèles Multi-Variables'),
+                **self.BASE_LAYOUT,
                 height=500
             )
             
@@ -871,20 +1059,28 @@ class AnalyticsDashboard:
                 df['property_type'].notna() & 
                 df['price'].notna() & 
                 (df['price'] > 0)
-            ].copy()
+            ]
             
             if df_clean.empty:
                 return self._create_empty_graph("Pas de données valides", "🌳 Treemap Hiérarchique")
             
-            # Agréger les données
-            hierarchy = df_clean.groupby(['city', 'property_type']).agg({
-                'price': ['count', 'mean']
-            }).reset_index()
-            
-            hierarchy.columns = ['city', 'property_type', 'count', 'avg_price']
-            
-            # Filtrer les groupes avec au moins 1 enregistrement
-            hierarchy = hierarchy[hierarchy['count'] > 0]
+            # Ville × type en un seul code entier (codes catégoriels) : effectifs et sommes en deux np.bincount
+            cities = df_clean['city'].astype('category').cat
+            types = df_clean['property_type'].astype('category').cat
+            n_types = len(types.categories)
+            pair = cities.codes.to_numpy(dtype=np.int64) * n_types + types.codes.to_numpy(dtype=np.int64)
+            n_pairs = len(cities.categories) * n_types
+            counts = np.bincount(pair, minlength=n_pairs)
+            sums = np.bincount(pair, weights=df_clean['price'].to_numpy(dtype=np.float64), minlength=n_pairs)
+            
+            # Groupes observés uniquement
+            present = np.flatnonzero(counts)
+            hierarchy = pd.DataFrame({
+                'city': cities.categories[present // n_types],
+                'property_type': types.categories[present % n_types],
+                'count': counts[present],
+                'avg_price': sums[present] / counts[present]
+            })
             
             if hierarchy.empty:
                 return self._create_empty_graph("Pas de groupes valides", "🌳 Treemap Hiérarchique")
@@ -893,7 +1089,8 @@ class AnalyticsDashboard:
                 labels=hierarchy['property_type'],
                 parents=hierarchy['city'],
                 values=hierarchy['count'],
-                text=hierarchy['avg_price'].apply(lambda x: f"{x/1_000_000:.1f}M" if pd.notna(x) and x > 0 else "N/A"),
+                customdata=hierarchy['avg_price'].to_numpy() / 1_000_000,
+                texttemplate='%{label}<br>%{customdata:.1f}M',
                 textposition='middle center',
                 marker=dict(
                     colorscale='Viridis',
@@ -902,13 +1099,8 @@ class AnalyticsDashboard:
             ))
             
             fig.update_layout(
-                title=dict(
-                    text='🌳 Treemap: Ville × Type × Volume',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
+                title=self.chart_title('🌳 Treemap: Ville × Type × Volume'),
+                **self.BASE_LAYOUT,
                 height=600
             )
             
@@ -942,7 +1134,7 @@ class AnalyticsDashboard:
                 return self._create_empty_graph("Pas assez de données", "⚫ Matrice Bulles 4D")
             
             # Échantillonner
-            df_sample = df_clean.sample(min(300, len(df_clean)))
+            df_sample = self._sample_for_plot(df_clean, self.BUBBLE_SAMPLE_SIZE)
             
             # S'assurer qu'il n'y a pas de NaN dans les colonnes critiques
             df_sample = df_sample.dropna(subset=['surface_area', 'price', 'bedrooms'])
@@ -954,7 +1146,8 @@ class AnalyticsDashboard:
             bubble_sizes = df_sample['bedrooms'] * 10
             bubble_sizes = bubble_sizes.fillna(10).clip(lower=5, upper=50)
             
-            fig = go.Figure(data=go.Scatter(
+            # WebGL : rendu GPU des bulles
+            fig = go.Figure(data=go.Scattergl(
                 x=df_sample['surface_area'],
                 y=df_sample['price'],
                 mode='markers',
@@ -967,23 +1160,15 @@ class AnalyticsDashboard:
                     line=dict(width=1, color='white'),
                     opacity=0.7
                 ),
-                text=df_sample.apply(
-                    lambda x: f"Surface: {x['surface_area']:.0f}m²<br>Prix: {x['price']/1_000_000:.1f}M<br>Chambres: {int(x['bedrooms'])}",
-                    axis=1
-                ),
-                hovertemplate='%{text}<extra></extra>'
+                customdata=np.column_stack([df_sample['price'] / 1_000_000, df_sample['bedrooms']]),
+                hovertemplate='Surface: %{x:.0f}m²<br>Prix: %{customdata[0]:.1f}M<br>Chambres: %{customdata[1]:.0f}<extra></extra>'
             ))
             
             fig.update_layout(
-                title=dict(
-                    text='⚫ Matrice Bulles 4D: Surface × Prix × Chambres × Prix/m²',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
+                title=self.chart_title('⚫ Matrice Bulles 4D: Surface × Prix × Chambres × Prix/m²'),
                 xaxis_title="Surface (m²)",
                 yaxis_title="Prix (FCFA)",
-                plot_bgcolor='white',
-                paper_bgcolor='white',
+                **self.BASE_LAYOUT,
                 height=600
             )
             
@@ -1041,19 +1226,12 @@ class AnalyticsDashboard:
                     line=dict(width=0.5, color='white'),
                     opacity=0.8
                 ),
-                text=df_clean.apply(
-                    lambda x: f"Cluster {x['cluster']}<br>Surface: {x['surface_area']:.0f}m²<br>Prix: {x['price']/1_000_000:.1f}M<br>Chambres: {x['bedrooms']}",
-                    axis=1
-                ),
-                hovertemplate='%{text}<extra></extra>'
+                customdata=np.column_stack([df_clean['cluster'], df_clean['price'] / 1_000_000]),
+                hovertemplate='Cluster %{customdata[0]}<br>Surface: %{x:.0f}m²<br>Prix: %{customdata[1]:.1f}M<br>Chambres: %{z}<extra></extra>'
             ))
             
             fig.update_layout(
-                title=dict(
-                    text=' Clustering K-Means 3D (ML)',
-                    font=dict(size=20, family='Outfit, sans-serif'),
-                    x=0
-                ),
+                title=self.chart_title(' Clustering K-Means 3D (ML)'),
                 scene=dict(
                     xaxis_title='Surface (m²)',
                     yaxis_title='Prix (FCFA)',
@@ -1061,8 +1239,7 @@ class AnalyticsDashboard:
                     camera=dict(eye=dict(x=1.5, y=1.5, z=1.3))
                 ),
                 height=650,
-                plot_bgcolor='white',
-                paper_bgcolor='white'
+                **self.BASE_LAYOUT
             )
             
             return fig
@@ -1082,28 +1259,9 @@ class AnalyticsDashboard:
             html.Div([
                 html.Div([
                     DashIconify(icon=icon, width=28, color="white")
-                ], style={
-                    'background': f'linear-gradient(135deg, {color}, {self.adjust_color_brightness(color, -20)})',
-                    'borderRadius': '16px',
-                    'padding': '14px',
-                    'display': 'flex',
-                    'alignItems': 'center',
-                    'justifyContent': 'center',
-                    'boxShadow': f'0 8px 16px {color}30',
-                    'marginBottom': '16px'
-                }),
-                html.Div(title, style={
-                    'fontSize': '13px',
-                    'fontWeight': '500',
-                    'color': self.COLORS['text_secondary'],
-                    'marginBottom': '8px'
-                }),
-                html.Div(str(value), style={
-                    'fontSize': '26px',
-                    'fontWeight': '700',
-                    'color': self.COLORS['text_primary'],
-                    'marginBottom': '8px'
-                }),
+                ], style=self.kpi_icon_style(color)),
+                html.Div(title, style=self.KPI_TITLE_STYLE),
+                html.Div(str(value), style=self.KPI_VALUE_STYLE),
                 html.Div([
                     DashIconify(
                         icon="mdi:trending-up" if trend and trend > 0 else "mdi:trending-neutral",
@@ -1120,18 +1278,28 @@ class AnalyticsDashboard:
                         }
                     )
                 ], style={'display': 'flex', 'alignItems': 'center'}) if trend is not None else html.Div()
-            ], style={
-                'background': 'white',
-                'borderRadius': '20px',
-                'padding': '24px',
-                'boxShadow': '0 4px 20px rgba(0,0,0,0.06)',
-                'border': f'1px solid {self.COLORS["border"]}',
-                'height': '100%'
-            })
+            ], style=self.KPI_CARD_STYLE)
         ], style={'height': '100%'})
     
-    def adjust_color_brightness(self, hex_color, percent):
-        """Ajuste la luminosité d'une couleur"""
+    @classmethod
+    @lru_cache(maxsize=16)
+    def kpi_icon_style(cls, color):
+        """Bloc icône en dégradé d'une carte KPI : calculé une fois par couleur de la palette"""
+        return {
+            'background': f'linear-gradient(135deg, {color}, {cls.adjust_color_brightness(color, -20)})',
+            'borderRadius': '16px',
+            'padding': '14px',
+            'display': 'flex',
+            'alignItems': 'center',
+            'justifyContent': 'center',
+            'boxShadow': f'0 8px 16px {color}30',
+            'marginBottom': '16px'
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def adjust_color_brightness(hex_color, percent):
+        """Ajuste la luminosité d'une couleur (mémorisé : palette fixe, appelé à chaque carte KPI)"""
         try:
             hex_color = hex_color.lstrip('#')
             r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
@@ -1173,7 +1341,9 @@ class AnalyticsDashboard:
             dcc.Location(id='analytics-url', refresh=False),
             
             # Store pour les données
-            dcc.Store(id='analytics-data-store', data=[]),
+            dcc.Store(id='analytics-data-store', data={}),
+            dcc.Store(id='analytics-data-version'),
+            dcc.Store(id='analytics-kpi-store'),
             dcc.Store(id='debug-store', data={'status': 'initializing'}),
             
             # Header premium
@@ -1326,10 +1496,10 @@ class AnalyticsDashboard:
                         html.Div("Chargement des KPIs...", style={'textAlign': 'center', 'padding': '20px'})
                     ], style={'marginBottom': '32px'}),
                     
-                    # Graphiques Grid
+                    # Graphiques Grid (spinner par graphique pendant le calcul côté serveur)
                     html.Div([
-                        html.Div(id='graph-violin', className='graph-container'),
-                        html.Div(id='graph-heatmap', className='graph-container'),
+                        dcc.Loading(html.Div(id='graph-violin', className='graph-container'), type='circle', color=self.COLORS['primary']),
+                        dcc.Loading(html.Div(id='graph-heatmap', className='graph-container'), type='circle', color=self.COLORS['primary']),
                     ], style={
                         'display': 'grid',
                         'gridTemplateColumns': 'repeat(auto-fit, minmax(600px, 1fr))',
@@ -1338,8 +1508,8 @@ class AnalyticsDashboard:
                     }),
                     
                     html.Div([
-                        html.Div(id='graph-3d-surface', className='graph-container'),
-                        html.Div(id='graph-stacked-area', className='graph-container'),
+                        dcc.Loading(html.Div(id='graph-3d-surface', className='graph-container'), type='circle', color=self.COLORS['primary']),
+                        dcc.Loading(html.Div(id='graph-stacked-area', className='graph-container'), type='circle', color=self.COLORS['primary']),
                     ], style={
                         'display': 'grid',
                         'gridTemplateColumns': 'repeat(auto-fit, minmax(600px, 1fr))',
@@ -1348,8 +1518,8 @@ class AnalyticsDashboard:
                     }),
                     
                     html.Div([
-                        html.Div(id='graph-parallel', className='graph-container'),
-                        html.Div(id='graph-treemap', className='graph-container'),
+                        dcc.Loading(html.Div(id='graph-parallel', className='graph-container'), type='circle', color=self.COLORS['primary']),
+                        dcc.Loading(html.Div(id='graph-treemap', className='graph-container'), type='circle', color=self.COLORS['primary']),
                     ], style={
                         'display': 'grid',
                         'gridTemplateColumns': 'repeat(auto-fit, minmax(600px, 1fr))',
@@ -1358,8 +1528,8 @@ class AnalyticsDashboard:
                     }),
                     
                     html.Div([
-                        html.Div(id='graph-bubble', className='graph-container'),
-                        html.Div(id='graph-clustering', className='graph-container'),
+                        dcc.Loading(html.Div(id='graph-bubble', className='graph-container'), type='circle', color=self.COLORS['primary']),
+                        dcc.Loading(html.Div(id='graph-clustering', className='graph-container'), type='circle', color=self.COLORS['primary']),
                     ], style={
                         'display': 'grid',
                         'gridTemplateColumns': 'repeat(auto-fit, minmax(600px, 1fr))',
@@ -1378,17 +1548,6 @@ class AnalyticsDashboard:
             'background': '#F8FAFC'
         })
     
-    @property
-    def graph_style(self):
-        """Style pour les graphiques"""
-        return {
-            'background': 'white',
-            'padding': '24px',
-            'borderRadius': '20px',
-            'boxShadow': '0 4px 20px rgba(0,0,0,0.06)',
-            'border': f'1px solid {self.COLORS["border"]}'
-        }
-    
     # ========================================================
     #                      CALLBACKS
     # ========================================================
@@ -1425,33 +1584,12 @@ class AnalyticsDashboard:
         
         @self.app.callback(
             [
+                Output('analytics-data-store', 'data'),
+                Output('analytics-data-version', 'data'),
+                Output('analytics-kpi-store', 'data'),
                 Output('filter-cities', 'options'),
                 Output('filter-properties', 'options')
             ],
-            Input('analytics-url', 'pathname')
-        )
-        def load_filter_options(path):
-            """Charger les options de filtres"""
-            try:
-                df = self.get_enriched_data(limit=10000)
-                
-                if df.empty:
-                    return [], []
-                
-                cities = sorted(df['city'].dropna().unique().tolist())
-                property_types = sorted(df['property_type'].dropna().unique().tolist())
-                
-                city_options = [{'label': f'📍 {city}', 'value': city} for city in cities]
-                type_options = [{'label': f'🏠 {ptype}', 'value': ptype} for ptype in property_types]
-                
-                return city_options, type_options
-                
-            except Exception as e:
-                print(f"Erreur chargement options: {e}")
-                return [], []
-        
-        @self.app.callback(
-            Output('analytics-data-store', 'data'),
             [
                 Input('btn-load-filtered', 'n_clicks'),
                 Input('analytics-url', 'pathname')
@@ -1464,7 +1602,9 @@ class AnalyticsDashboard:
             ]
         )
         def load_with_filters(n_clicks, path, cities, properties, price_range, status):
-            """Charger les données avec filtres + FILTRE STATUT CRITIQUE"""
+            """Charger les données avec filtres + FILTRE STATUT CRITIQUE (une seule requête par chargement)"""
+            # Les options de filtres ne sont recalculées qu'au chargement de la page
+            city_options = type_options = dash.no_update
             try:
                 filters = {}
                 
@@ -1477,10 +1617,16 @@ class AnalyticsDashboard:
                 if price_range:
                     filters['price_range'] = price_range
                 
-                df = self.get_enriched_data(filters=filters if filters else None, limit=5000)
+                df, loaded_at = self.cached_enriched_data(filters, limit=5000)
+                # Clé des figures : mêmes filtres, même statut, même chargement -> mêmes graphiques
+                version = json.dumps([loaded_at, filters, status], default=str)
+                
+                if ctx.triggered_id != 'btn-load-filtered':
+                    # Options tirées de SELECT DISTINCT, indépendantes des filtres courants
+                    city_options, type_options = self.filter_options()
                 
                 if df.empty:
-                    return []
+                    return {}, None, None, city_options, type_options
                 
                 # 🔴 CRITIQUE: FILTRER PAR STATUT AVANT TOUTE ANALYSE
                 if status and status != 'Tous' and 'status' in df.columns:
@@ -1489,33 +1635,28 @@ class AnalyticsDashboard:
                 
                 if df.empty:
                     print(f"⚠️ Aucune donnée après filtre statut: {status}")
-                    return []
+                    return {}, None, None, city_options, type_options
                 
-                # Convertir en dict pour le store
-                data = df.to_dict('records')
+                # KPIs calculés ici, sur le DataFrame déjà en mémoire : le callback KPI ne relit pas le store
+                kpis = self.calculate_ultra_kpis(df)
                 
-                return data
+                # Store orienté colonnes : une liste par colonne, clés non répétées à chaque ligne
+                return df.to_dict('list'), version, kpis, city_options, type_options
                 
             except Exception as e:
                 print(f"Erreur chargement données: {e}")
                 traceback.print_exc()
-                return []
+                return {}, None, None, city_options, type_options
         
         @self.app.callback(
             Output('kpi-section', 'children'),
-            Input('analytics-data-store', 'data')
+            Input('analytics-kpi-store', 'data')
         )
-        def update_kpis(data):
-            """Mettre à jour les KPIs"""
+        def update_kpis(kpis):
+            """Mettre à jour les KPIs (valeurs pré-calculées au chargement)"""
             try:
-                if not data or len(data) == 0:
-                    return html.Div("Aucune donnée disponible", style={
-                        'textAlign': 'center',
-                        'padding': '40px',
-                        'color': self.COLORS['text_secondary']
-                    })
-                
-                kpis = self.calculate_ultra_kpis(data)
+                if not kpis:
+                    return self._empty_kpis
                 
                 return html.Div([
                     html.Div([
@@ -1572,60 +1713,59 @@ class AnalyticsDashboard:
                 Output('graph-bubble', 'children'),
                 Output('graph-clustering', 'children')
             ],
-            Input('analytics-data-store', 'data')
+            Input('analytics-data-store', 'data'),
+            State('analytics-data-version', 'data')
         )
-        def update_all_graphs(data):
+        def update_all_graphs(data, version):
             """Mettre à jour tous les graphiques - DONNÉES DÉJÀ FILTRÉES PAR STATUT"""
             try:
                 if not data or len(data) == 0:
-                    empty = html.Div("Aucune donnée - Vérifiez les filtres (notamment le STATUT)", style={
-                        'textAlign': 'center', 'padding': '40px',
-                        'background': 'white', 'borderRadius': '20px',
-                        'boxShadow': '0 4px 20px rgba(0,0,0,0.06)',
-                        'color': self.COLORS['warning']
-                    })
-                    return [empty] * 8
+                    return [self._empty_graphs] * 8
+                
+                # Même version déjà affichée (filtres revus sans rechargement) : figures servies depuis le cache
+                figures = self._figure_cache.get(version) if version is not None else None
+                if figures is not None:
+                    self._figure_cache.move_to_end(version)
+                    return [
+                        html.Div([dcc.Graph(figure=figure, config=self.GRAPH_CONFIG)], style=self.GRAPH_STYLE)
+                        for figure in figures
+                    ]
+                
+                # DataFrame reconstruit une seule fois (dtypes compacts) et partagé par les 8 graphiques
+                df = self.optimize_dtypes(pd.DataFrame(data))
                 
                 # Vérifier que les données ont bien le champ status
-                df_check = pd.DataFrame(data)
-                if 'status' in df_check.columns:
-                    status_counts = df_check['status'].value_counts().to_dict()
+                if 'status' in df.columns:
+                    status_counts = df['status'].value_counts().to_dict()
                     print(f"✅ Graphiques avec données filtrées: {status_counts}")
                 else:
                     print("⚠️ Champ 'status' manquant dans les données")
                 
+                # Builders indépendants (lecture seule sur df) : exécutés en parallèle
+                builders = (
+                    self.create_superposed_violin_ridgeplot,
+                    partial(self.create_multi_layer_heatmap, version=version),
+                    self.create_stacked_3d_surface,
+                    self.create_stacked_area_trends,
+                    self.create_parallel_coords_advanced,
+                    self.create_treemap_sunburst_combo,
+                    self.create_bubble_matrix_4d,
+                    self.create_clustering_3d
+                )
+                futures = [self._figure_executor.submit(builder, df) for builder in builders]
+                
+                # Dicts prêts à sérialiser : mis en cache sans copie de go.Figure
+                figures = [future.result().to_dict() for future in futures]
+                if version is not None:
+                    self._figure_cache[version] = figures
+                    while len(self._figure_cache) > self.FIGURE_CACHE_SIZE:
+                        self._figure_cache.popitem(last=False)
+                
                 graphs = [
                     html.Div([
-                        dcc.Graph(figure=self.create_superposed_violin_ridgeplot(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_multi_layer_heatmap(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_stacked_3d_surface(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_stacked_area_trends(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_parallel_coords_advanced(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_treemap_sunburst_combo(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_bubble_matrix_4d(data), config={'displayModeBar': False})
-                    ], style=self.graph_style),
-                    
-                    html.Div([
-                        dcc.Graph(figure=self.create_clustering_3d(data), config={'displayModeBar': False})
-                    ], style=self.graph_style)
+                        dcc.Graph(figure=figure, config=self.GRAPH_CONFIG)
+                    ], style=self.GRAPH_STYLE)
+                    for figure in figures
                 ]
                 
                 return graphs
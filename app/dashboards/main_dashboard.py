@@ -127,9 +127,25 @@ class EnhancedMainDashboard:
     def get_time_series(self):
         """Série temporelle des prix"""
         try:
-            # Simuler des données temporelles (en vrai, utiliser une colonne date)
-            dates = pd.date_range(end=datetime.now(), periods=30, freq='D')
-            prices = np.random.normal(loc=50000000, scale=10000000, size=30).cumsum()
+            # Prix moyen journalier réel sur 30 jours (agrégé en SQL, plus de série aléatoire)
+            since = datetime.utcnow() - timedelta(days=30)
+            rows = []
+            for model in [CoinAfrique, ExpatDakarProperty, LogerDakarProperty]:
+                day = db.func.date(model.scraped_at)
+                rows.extend(
+                    db.session.query(day, db.func.sum(model.price), db.func.count(model.price))
+                    .filter(model.scraped_at >= since, model.price > 0)
+                    .group_by(day)
+                    .all()
+                )
+            
+            daily = pd.DataFrame(rows, columns=['date', 'total', 'count'])
+            if daily.empty:
+                return go.Figure()
+            daily[['total', 'count']] = daily[['total', 'count']].astype(float)
+            daily = daily.groupby('date').sum().sort_index()
+            dates = pd.to_datetime(daily.index)
+            prices = (daily['total'] / daily['count']).to_numpy()
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
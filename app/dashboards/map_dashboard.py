@@ -6,7 +6,7 @@ Version: 2.0 - Enhanced
 """
 
 import dash
-from dash import html, dcc, Input, Output, callback, State
+from dash import html, dcc, Input, Output, callback, State, ALL, ctx, no_update
 import dash_mantine_components as dmc
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
@@ -19,6 +19,8 @@ import numpy as np
 import logging
 import traceback
 import base64
+from collections import OrderedDict
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 
 # Import du détecteur de statut
@@ -58,6 +60,31 @@ class PremiumMapDashboard:
         'border': '#334155'
     }
     
+    # Colonnes numériques stockées en float32 (précision largement suffisante pour l'affichage)
+    FLOAT32_COLUMNS = ('price', 'surface_area', 'price_per_m2', 'bedrooms', 'bathrooms', 'age_days',
+                       'city_density_score', 'affordability_score', 'freshness_score')
+    # Coordonnées en float32 (~1 m de précision), population entière en int32 (toujours renseignée)
+    COORD_COLUMNS = ('lat', 'lon')
+    INT32_COLUMNS = ('population',)
+    # Colonnes texte à faible cardinalité, stockées en `category` (groupby sur codes entiers)
+    CATEGORY_COLUMNS = ('city', 'city_display', 'region', 'property_type', 'status', 'source')
+    
+    # Durée de validité (secondes) des données cartographiques mémorisées par jeu de sources
+    DATA_CACHE_TIMEOUT = 300
+    # Nombre de figures gardées en mémoire (clé : version des données + entrées dont la figure dépend)
+    FIGURE_CACHE_SIZE = 32
+    
+    # Cartes KPI (icône, titre) : rendues une fois dans le layout, le callback n'envoie que les valeurs
+    KPI_CARDS = (
+        ("🏠", "Annonces Totales"),
+        ("💰", "À Vendre"),
+        ("🏘️", "À Louer"),
+        ("🏙️", "Villes"),
+        ("💵", "Prix Médian"),
+        ("📐", "Prix/m²"),
+    )
+    KPI_EMPTY_VALUE = "—"
+    
     # Coordonnées précises des villes sénégalaises
     CITY_COORDINATES = {
         "dakar": {"lat": 14.6928, "lon": -17.4467, "region": "Cap-Vert", "population": 1030594},
@@ -84,6 +111,10 @@ class PremiumMapDashboard:
     }
     
     def __init__(self, server=None, routes_pathname_prefix="/map/", requests_pathname_prefix="/map/"):
+        # Enregistrements du store déjà calculés, par sources : {sources: (horodatage, records)}
+        self._data_cache = {}
+        # Figures déjà construites, en dicts (LRU) : {(nom, version, entrées): figure}
+        self._figure_cache = OrderedDict()
         # CSS personnalisé
         self.custom_css = """
         * { font-family: 'Outfit', sans-serif; }
@@ -104,6 +135,8 @@ class PremiumMapDashboard:
             routes_pathname_prefix=routes_pathname_prefix,
             requests_pathname_prefix=requests_pathname_prefix,
             suppress_callback_exceptions=True,
+            # Pas de "Updating..." dans l'onglet à chaque callback
+            update_title=None,
             meta_tags=[{
                 "name": "viewport",
                 "content": "width=device-width, initial-scale=1, maximum-scale=1"
@@ -162,6 +195,99 @@ class PremiumMapDashboard:
         
         return cleaned
     
+    def cached_map_records(self, sources=None, refresh=False):
+        """Enregistrements du store mémorisés DATA_CACHE_TIMEOUT secondes par jeu de sources
+        
+        Retourne (records, version) ; la version (sources + horodatage du chargement) change à chaque relecture en base.
+        """
+        key = tuple(sorted(sources)) if sources else ()
+        entry = self._data_cache.get(key)
+        if refresh or entry is None or datetime.now() - entry[0] >= timedelta(seconds=self.DATA_CACHE_TIMEOUT):
+            df = self.get_enhanced_map_data(sources)
+            records = df.to_dict('records') if not df.empty else []
+            if not records:
+                return [], None
+            entry = (datetime.now(), records)
+            self._data_cache[key] = entry
+        return entry[1], f"{'|'.join(key)}@{entry[0].isoformat()}"
+    
+    def cached_figure(self, name, key, builder, *args):
+        """Figure `name` mémorisée par clé (version + entrées), en dict déjà sérialisable ; sans version, construite sans cache"""
+        if key[0] is None:
+            return builder(*args)
+        
+        cache_key = (name, *key)
+        figure = self._figure_cache.get(cache_key)
+        if figure is not None:
+            self._figure_cache.move_to_end(cache_key)
+            return figure
+        
+        # Dict brut (to_dict une fois) : un cache hit renvoie directement le JSON à encoder, sans re-parcourir la go.Figure
+        figure = builder(*args)
+        if isinstance(figure, go.Figure):
+            figure = figure.to_dict()
+        self._figure_cache[cache_key] = figure
+        while len(self._figure_cache) > self.FIGURE_CACHE_SIZE:
+            self._figure_cache.popitem(last=False)
+        return figure
+    
+    def map_rows_frame(self, partition, source_name, has_title, has_status):
+        """DataFrame d'un lot de lignes lues en base (ville nettoyée, coordonnées, statut détecté)"""
+        rows = []
+        for prop in partition:
+            try:
+                # Nettoyer le nom de la ville - CRITIQUE
+                city_raw = str(prop.city) if prop.city else None
+                city_clean = self.clean_city_name(city_raw)
+            
+                # Vérifier si la ville est dans nos coordonnées
+                if not city_clean or city_clean not in self.CITY_COORDINATES:
+                    continue
+            
+                coords = self.CITY_COORDINATES[city_clean]
+            
+                # Extraire les données de base
+                price = float(prop.price) if prop.price else 0
+                surface = float(prop.surface_area) if prop.surface_area and prop.surface_area > 0 else None
+                title = str(prop.title) if has_title and prop.title else None
+                prop_type = str(prop.property_type) if prop.property_type else 'Autre'
+            
+                # NOUVEAU: Détecter le statut (Vente/Location)
+                # Vérifier d'abord si la source a un champ 'status' natif
+                native_status = str(prop.status) if has_status and prop.status else None
+            
+                # Utiliser le module StatusDetector
+                status = detect_listing_status(
+                    title=title,
+                    price=price,
+                    property_type=prop_type,
+                    source=source_name,
+                    native_status=native_status
+                )
+            
+                rows.append({
+                    'city': city_clean,
+                    'city_display': city_clean.title(),
+                    'region': coords['region'],
+                    'population': coords['population'],
+                    'lat': coords['lat'],
+                    'lon': coords['lon'],
+                    'property_type': prop_type,
+                    'status': status,  # NOUVEAU: Vente ou Location
+                    'title': title[:100] if title else None,
+                    'price': price,
+                    'surface_area': surface,
+                    'bedrooms': int(prop.bedrooms) if prop.bedrooms else None,
+                    'bathrooms': int(prop.bathrooms) if prop.bathrooms else None,
+                    'scraped_at': prop.scraped_at,
+                    'source': source_name
+                })
+            
+            except Exception as e:
+                logger.warning(f"Erreur traitement propriété: {e}")
+                continue
+        return pd.DataFrame(rows)
+    
     def get_enhanced_map_data(self, sources=None):
         """
         Récupération enrichie des données cartographiques
@@ -174,7 +300,8 @@ class PremiumMapDashboard:
                 logger.error("DB non disponible")
                 return pd.DataFrame()
             
-            all_data = []
+            # Un DataFrame par lot lu en base (pas de liste de dicts de toutes les annonces)
+            frames = []
             
             # Définir les sources à interroger
             models_to_query = []
@@ -187,7 +314,10 @@ class PremiumMapDashboard:
             
             for model, source_name in models_to_query:
                 try:
-                    properties = db.session.query(
+                    # Colonnes optionnelles résolues une fois par modèle (et non par annonce), sélectionnées seulement si présentes
+                    has_title = hasattr(model, 'title')
+                    has_status = hasattr(model, 'status')
+                    columns = [
                         model.city,
                         model.property_type,
                         model.price,
@@ -195,103 +325,60 @@ class PremiumMapDashboard:
                         model.bedrooms,
                         model.bathrooms,
                         model.scraped_at
-                    ).filter(
-                        model.city.isnot(None),
-                        model.price.isnot(None),
-                        model.price > 10000,
-                        model.price < 1e10
-                    ).limit(3000).all()
+                    ]
+                    if has_title:
+                        columns.append(model.title)
+                    if has_status:
+                        columns.append(model.status)
                     
-                    logger.info(f"{source_name}: {len(properties)} propriétés trouvées")
+                    result = db.session.execute(
+                        select(*columns).where(
+                            model.city.isnot(None),
+                            model.price.isnot(None),
+                            model.price > 10000,
+                            model.price < 1e10
+                        ).limit(3000).execution_options(yield_per=500)
+                    )
+                    
+                    # Lignes consommées par lots de 500 (curseur serveur), chaque lot converti aussitôt en DataFrame
+                    n_found = 0
+                    for partition in result.partitions(500):
+                        n_found += len(partition)
+                        frames.append(self.map_rows_frame(partition, source_name, has_title, has_status))
+                    
+                    logger.info(f"{source_name}: {n_found} propriétés trouvées")
                     
-                    for prop in properties:
-                        try:
-                            # Nettoyer le nom de la ville - CRITIQUE
-                            city_raw = str(prop.city) if prop.city else None
-                            city_clean = self.clean_city_name(city_raw)
-                            
-                            # Vérifier si la ville est dans nos coordonnées
-                            if not city_clean or city_clean not in self.CITY_COORDINATES:
-                                continue
-                            
-                            coords = self.CITY_COORDINATES[city_clean]
-                            
-                            # Extraire les données de base
-                            price = float(prop.price) if prop.price else 0
-                            surface = float(prop.surface_area) if prop.surface_area and prop.surface_area > 0 else None
-                            title = str(prop.title) if hasattr(prop, 'title') and prop.title else None
-                            prop_type = str(prop.property_type) if prop.property_type else 'Autre'
-                            
-                            # NOUVEAU: Détecter le statut (Vente/Location)
-                            # Vérifier d'abord si la source a un champ 'status' natif
-                            native_status = str(prop.status) if hasattr(prop, 'status') and prop.status else None
-                            
-                            # Utiliser le module StatusDetector
-                            status = detect_listing_status(
-                                title=title,
-                                price=price,
-                                property_type=prop_type,
-                                source=source_name,
-                                native_status=native_status
-                            )
-                            
-                            # Calculer prix/m²
-                            price_per_m2 = price / surface if surface and surface > 0 and price > 0 else None
-                            
-                            # Calculer l'âge de l'annonce
-                            age_days = None
-                            if prop.scraped_at:
-                                age_days = (datetime.utcnow() - prop.scraped_at).days
-                            
-                            all_data.append({
-                                'city': city_clean,
-                                'city_display': city_clean.title(),
-                                'region': coords['region'],
-                                'population': coords['population'],
-                                'lat': coords['lat'],
-                                'lon': coords['lon'],
-                                'property_type': prop_type,
-                                'status': status,  # NOUVEAU: Vente ou Location
-                                'title': title[:100] if title else None,
-                                'price': price,
-                                'surface_area': surface,
-                                'price_per_m2': price_per_m2,
-                                'bedrooms': int(prop.bedrooms) if prop.bedrooms else None,
-                                'bathrooms': int(prop.bathrooms) if prop.bathrooms else None,
-                                'age_days': age_days,
-                                'source': source_name
-                            })
-                            
-                        except Exception as e:
-                            logger.warning(f"Erreur traitement propriété: {e}")
-                            continue
-                            
                 except Exception as e:
                     logger.error(f"Erreur requête {source_name}: {e}")
                     continue
             
-            if not all_data:
+            frames = [frame for frame in frames if not frame.empty]
+            if not frames:
                 logger.warning("Aucune donnée récupérée")
                 return pd.DataFrame()
             
-            df = pd.DataFrame(all_data)
-            df['city'] = df['city'].apply(lambda x: x.lower().split(',')[0] if isinstance(x, str) else x)
-            df['city_display'] = df['city_display'].apply(lambda x: x.title() if isinstance(x, str) else x)
+            df = pd.concat(frames, ignore_index=True)
+            df['city'] = df['city'].str.lower().str.split(',').str[0]
+            df['city_display'] = df['city_display'].str.title()
+            
+            # Colonnes dérivées calculées une fois sur tout le DataFrame (et non annonce par annonce)
+            sa = df['surface_area'].to_numpy(dtype=np.float64)
+            p = df['price'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                df['price_per_m2'] = np.where((sa > 0) & (p > 0), p / sa, np.nan)
+            df['age_days'] = (pd.Timestamp(datetime.utcnow()) - pd.to_datetime(df.pop('scraped_at'), errors='coerce')).dt.days
             # Enrichissement des données
             if not df.empty:
+                # Scores par ville diffusés sur les lignes via transform (pas de lambda par annonce)
+                by_city = df.groupby('city', sort=False)['price']
+                
                 # Score de densité par ville (nombre d'annonces / population)
-                city_counts = df.groupby('city').size()
-                df['city_density_score'] = df['city'].map(
-                    lambda c: (city_counts.get(c, 0) / self.CITY_COORDINATES[c]['population'] * 100000)
-                    if c in self.CITY_COORDINATES else 0
-                )
+                population = df['city'].map({c: info['population'] for c, info in self.CITY_COORDINATES.items()})
+                df['city_density_score'] = (by_city.transform('size') / population * 100000).fillna(0)
                 
                 # Score d'accessibilité (basé sur prix médian de la ville)
-                city_median_price = df.groupby('city')['price'].median()
                 overall_median = df['price'].median()
-                df['affordability_score'] = df['city'].map(
-                    lambda c: 100 - min(100, (city_median_price.get(c, overall_median) / overall_median * 100))
-                )
+                df['affordability_score'] = 100 - np.minimum(100, by_city.transform('median') / overall_median * 100)
                 
                 # Catégoriser les prix
                 df['price_category'] = pd.cut(
@@ -301,19 +388,38 @@ class PremiumMapDashboard:
                 )
                 
                 # Score de fraîcheur (basé sur age_days)
-                df['freshness_score'] = df['age_days'].apply(
-                    lambda x: 100 - min(100, x * 2) if pd.notna(x) and x >= 0 else 50
-                )
+                age = df['age_days'].to_numpy(dtype=np.float64)
+                with np.errstate(invalid='ignore'):
+                    df['freshness_score'] = np.where(age >= 0, 100 - np.minimum(100, age * 2), 50)
             
             logger.info(f"DataFrame final: {len(df)} enregistrements, {df['city'].nunique()} villes")
             
-            return df
+            return self.optimize_dtypes(df)
             
         except Exception as e:
             logger.error(f"Erreur critique get_enhanced_map_data: {e}")
             traceback.print_exc()
             return pd.DataFrame()
     
+    def optimize_dtypes(self, df):
+        """Dtypes compacts : `category` pour le texte répétitif, float32/int32 pour les nombres"""
+        if df.empty:
+            return df
+        
+        for col in self.CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        for col in self.FLOAT32_COLUMNS + self.COORD_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        
+        for col in self.INT32_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int32')
+        
+        return df
+    
     # ==================== VISUALISATIONS ====================
     
     def create_interactive_map(self, df, color_by='price'):
@@ -348,48 +454,32 @@ class PremiumMapDashboard:
             # Agréger par ville avec une approche plus sûre
             group_cols = ['city', 'city_display', 'lat', 'lon', 'region']
             
-            # Calculer les agrégations séparément pour plus de contrôle
-            city_counts = df_map.groupby(group_cols).size().reset_index(name='count')
-            city_price_median = df_map.groupby(group_cols)['price'].median().reset_index(name='median_price')
-            city_price_mean = df_map.groupby(group_cols)['price'].mean().reset_index(name='mean_price')
-            
-            # Agrégation conditionnelle pour price_per_m2
-            if 'price_per_m2' in df_map.columns and df_map['price_per_m2'].notna().any():
-                city_price_m2 = df_map.groupby(group_cols)['price_per_m2'].median().reset_index(name='median_price_m2')
-            else:
-                city_price_m2 = pd.DataFrame(columns=group_cols + ['median_price_m2'])
-            
-            # Agrégation pour la colonne de couleur
-            city_color = df_map.groupby(group_cols)[color_col].mean().reset_index(name='color_value')
-            
-            # Fusionner tous les DataFrames
-            city_agg = city_counts
-            for df_merge in [city_price_median, city_price_mean, city_price_m2, city_color]:
-                if not df_merge.empty:
-                    city_agg = pd.merge(city_agg, df_merge, on=group_cols, how='left')
-            
-            # S'assurer que toutes les colonnes nécessaires existent
-            required_cols = ['count', 'median_price', 'mean_price', 'color_value']
-            for col in required_cols:
-                if col not in city_agg.columns:
-                    city_agg[col] = np.nan
+            # Un seul groupby avec agrégations nommées (au lieu de 5 groupby + 4 merges)
+            aggs = {
+                'count': ('price', 'size'),
+                'median_price': ('price', 'median'),
+                'mean_price': ('price', 'mean'),
+                'color_value': (color_col, 'mean')
+            }
+            if 'price_per_m2' in df_map.columns:
+                aggs['median_price_m2'] = ('price_per_m2', 'median')
+            city_agg = df_map.groupby(group_cols, observed=True, sort=False).agg(**aggs).reset_index()
             
             # ======= FIN DE LA CORRECTION =======
             
-            # Créer le hover text de manière robuste
-            def create_hover_text(row):
-                text = f"<b>{row['city_display']}</b><br>"
-                text += f"Région: {row['region']}<br>"
-                text += f"Annonces: {int(row['count'])}<br>"
-                text += f"Prix médian: {row['median_price']/1_000_000:.1f}M FCFA"
-                
-                # Ajouter prix/m² seulement si disponible
-                if 'median_price_m2' in row and pd.notna(row['median_price_m2']):
-                    text += f"<br>Prix/m²: {row['median_price_m2']:.0f} FCFA"
-                
-                return text
+            # Hover text construit colonne par colonne (concaténation de chaînes vectorisée)
+            hover_text = (
+                "<b>" + city_agg['city_display'].astype(str) + "</b><br>"
+                + "Région: " + city_agg['region'].astype(str) + "<br>"
+                + "Annonces: " + city_agg['count'].astype(int).astype(str) + "<br>"
+                + "Prix médian: " + (city_agg['median_price'] / 1_000_000).round(1).astype(str) + "M FCFA"
+            )
             
-            city_agg['hover_text'] = city_agg.apply(create_hover_text, axis=1)
+            # Ajouter prix/m² seulement si disponible
+            if 'median_price_m2' in city_agg.columns:
+                ppm2 = city_agg['median_price_m2']
+                hover_text = hover_text + ("<br>Prix/m²: " + ppm2.round(0).astype('Int64').astype(str) + " FCFA").where(ppm2.notna(), "")
+            city_agg['hover_text'] = hover_text
             
             # Créer la carte
             fig = go.Figure()
@@ -399,7 +489,7 @@ class PremiumMapDashboard:
                 lon=city_agg['lon'],
                 mode='markers',
                 marker=dict(
-                    size=city_agg['count'].apply(lambda x: min(50, 10 + x/10)),
+                    size=np.minimum(50, 10 + city_agg['count'].to_numpy() / 10),
                     color=city_agg['color_value'],
                     colorscale='Viridis',
                     showscale=True,
@@ -493,14 +583,14 @@ class PremiumMapDashboard:
         
         try:
             # Top 10 villes par nombre d'annonces
-            city_stats = df.groupby('city_display').agg({
+            city_stats = df.groupby('city_display', observed=True).agg({
                 'price': ['count', 'median'],
                 'price_per_m2': 'median',
                 'affordability_score': 'mean'
             }).reset_index()
             
             city_stats.columns = ['city', 'count', 'median_price', 'median_price_m2', 'affordability']
-            city_stats = city_stats.sort_values('count', ascending=False).head(10)
+            city_stats = city_stats.nlargest(10, 'count')
             
             fig = make_subplots(
                 rows=1, cols=2,
@@ -567,7 +657,7 @@ class PremiumMapDashboard:
         
         try:
             # Statistiques par statut
-            status_stats = df.groupby('status').agg({
+            status_stats = df.groupby('status', observed=True).agg({
                 'price': ['count', 'median', 'mean'],
                 'price_per_m2': 'median'
             }).reset_index()
@@ -633,7 +723,7 @@ class PremiumMapDashboard:
             return go.Figure()
         
         try:
-            regional_stats = df.groupby('region').agg({
+            regional_stats = df.groupby('region', observed=True).agg({
                 'price': ['count', 'mean', 'median'],
                 'affordability_score': 'mean',
                 'city_density_score': 'mean'
@@ -717,6 +807,8 @@ class PremiumMapDashboard:
             
             # Store pour les données
             dcc.Store(id='map-data-store', data=[]),
+            # Version des données du store (clé du cache de figures)
+            dcc.Store(id='map-data-version'),
             
             # Header
             html.Div([
@@ -908,7 +1000,15 @@ class PremiumMapDashboard:
                     }),
                     
                     # KPIs
-                    html.Div(id='map-kpi-section', style={'marginBottom': '32px'}),
+                    html.Div([
+                        self.create_kpi_card(icon, title, self.KPI_EMPTY_VALUE, index=i)
+                        for i, (icon, title) in enumerate(self.KPI_CARDS)
+                    ], id='map-kpi-section', style={
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))',
+                        'gap': '20px',
+                        'marginBottom': '32px'
+                    }),
                     
                     # Carte principale
                     html.Div([
@@ -981,7 +1081,10 @@ class PremiumMapDashboard:
         """Configuration des callbacks"""
         
         @self.app.callback(
-            Output('map-data-store', 'data'),
+            [
+                Output('map-data-store', 'data'),
+                Output('map-data-version', 'data')
+            ],
             [
                 Input('map-url', 'pathname'),
                 Input('map-refresh-button', 'n_clicks')
@@ -989,61 +1092,52 @@ class PremiumMapDashboard:
             State('map-sources', 'value')
         )
         def load_map_data(pathname, n_clicks, sources):
-            """Charger les données cartographiques"""
+            """Charger les données cartographiques (rechargement forcé par le bouton)"""
             try:
-                df = self.get_enhanced_map_data(sources)
-                
-                if df.empty:
-                    return []
-                
-                # Convertir en dict pour le store
-                return df.to_dict('records')
+                return self.cached_map_records(sources, refresh=ctx.triggered_id == 'map-refresh-button')
                 
             except Exception as e:
                 logger.error(f"Erreur load_map_data: {e}")
-                return []
+                return [], None
         
         @self.app.callback(
-            Output('map-kpi-section', 'children'),
+            Output({'type': 'map-kpi-value', 'index': ALL}, 'children'),
             Input('map-data-store', 'data')
         )
         def update_kpis(data):
-            """Mettre à jour les KPIs avec statut"""
+            """Mettre à jour les valeurs des KPIs (6 chaînes, les cartes restent en place)"""
+            empty = [self.KPI_EMPTY_VALUE] * len(self.KPI_CARDS)
             try:
                 if not data:
-                    return html.Div("Aucune donnée", style={
-                        'textAlign': 'center',
-                        'padding': '40px',
-                        'color': self.COLORS['text_secondary']
-                    })
+                    return empty
                 
-                df = pd.DataFrame(data)
+                df = self.optimize_dtypes(pd.DataFrame(data))
                 
                 total_annonces = len(df)
                 total_villes = df['city'].nunique()
-                prix_median = df['price'].median()
-                prix_m2_median = df['price_per_m2'].median() if 'price_per_m2' in df.columns else 0
+                # Médianes prix et prix/m² en une seule réduction
+                medians = df[[col for col in ('price', 'price_per_m2') if col in df.columns]].median()
+                prix_median = medians['price']
+                prix_m2_median = medians.get('price_per_m2', 0)
                 
-                # Nouveaux KPIs basés sur le statut
-                vente_count = len(df[df['status'] == 'Vente']) if 'status' in df.columns else 0
-                location_count = len(df[df['status'] == 'Location']) if 'status' in df.columns else 0
+                # Nouveaux KPIs basés sur le statut (un seul value_counts au lieu de deux masques + copies)
+                status_counts = df['status'].value_counts() if 'status' in df.columns else pd.Series(dtype='int64')
+                vente_count = int(status_counts.get('Vente', 0))
+                location_count = int(status_counts.get('Location', 0))
                 
-                return html.Div([
-                    self.create_kpi_card("🏠", "Annonces Totales", f"{total_annonces:,}".replace(',', ' ')),
-                    self.create_kpi_card("💰", "À Vendre", f"{vente_count:,}".replace(',', ' ')),
-                    self.create_kpi_card("🏘️", "À Louer", f"{location_count:,}".replace(',', ' ')),
-                    self.create_kpi_card("🏙️", "Villes", str(total_villes)),
-                    self.create_kpi_card("💵", "Prix Médian", f"{prix_median/1_000_000:.1f}M"),
-                    self.create_kpi_card("📐", "Prix/m²", f"{prix_m2_median:,.0f}".replace(',', ' ')),
-                ], style={
-                    'display': 'grid',
-                    'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))',
-                    'gap': '20px'
-                })
+                # Même ordre que KPI_CARDS
+                return [
+                    f"{total_annonces:,}".replace(',', ' '),
+                    f"{vente_count:,}".replace(',', ' '),
+                    f"{location_count:,}".replace(',', ' '),
+                    str(total_villes),
+                    f"{prix_median/1_000_000:.1f}M",
+                    f"{prix_m2_median:,.0f}".replace(',', ' '),
+                ]
                 
             except Exception as e:
                 logger.error(f"Erreur update_kpis: {e}")
-                return html.Div()
+                return empty
         
         @self.app.callback(
             [
@@ -1057,16 +1151,18 @@ class PremiumMapDashboard:
                 Input('map-color-by', 'value'),
                 Input('map-type', 'value'),
                 Input('map-status-filter', 'value')
-            ]
+            ],
+            State('map-data-version', 'data')
         )
-        def update_visualizations(data, color_by, map_type, status_filter):
-            """Mettre à jour toutes les visualisations avec filtre statut"""
+        def update_visualizations(data, color_by, map_type, status_filter, version):
+            """Mettre à jour toutes les visualisations avec filtre statut (figures mémorisées par version + entrées)"""
             try:
                 if not data:
                     empty = self.create_empty_figure("Chargement...")
                     return empty, go.Figure(), go.Figure(), go.Figure()
                 
-                df = pd.DataFrame(data)
+                # Un seul DataFrame construit depuis le store (la distribution statut garde la version non filtrée)
+                df_all = df = self.optimize_dtypes(pd.DataFrame(data))
                 
                 # Appliquer le filtre statut
                 if status_filter and status_filter != 'Tous' and 'status' in df.columns:
@@ -1078,19 +1174,26 @@ class PremiumMapDashboard:
                 
                 # Carte principale
                 if map_type == 'heatmap':
-                    main_map = self.create_heatmap_density(df)
+                    main_map = self.cached_figure('heatmap', (version, status_filter), self.create_heatmap_density, df)
                 else:
-                    main_map = self.create_interactive_map(df, color_by)
+                    main_map = self.cached_figure(
+                        'map', (version, status_filter, color_by), self.create_interactive_map, df, color_by
+                    )
                 
-                # Distribution statut (utiliser toutes les données, pas filtrées)
-                df_all = pd.DataFrame(data)
-                status_dist = self.create_status_distribution(df_all)
+                # Options d'affichage de la carte : seule la carte dépend de ces entrées
+                if ctx.triggered_id in ('map-color-by', 'map-type'):
+                    return main_map, no_update, no_update, no_update
+                
+                # Distribution statut (utiliser toutes les données, pas filtrées) : inchangée par le filtre statut
+                status_dist = no_update if ctx.triggered_id == 'map-status-filter' else self.cached_figure(
+                    'status', (version,), self.create_status_distribution, df_all
+                )
                 
                 # Comparaison des villes (avec filtre)
-                city_comp = self.create_city_comparison_chart(df)
+                city_comp = self.cached_figure('cities', (version, status_filter), self.create_city_comparison_chart, df)
                 
                 # Analyse régionale (avec filtre)
-                regional = self.create_regional_analysis(df)
+                regional = self.cached_figure('regions', (version, status_filter), self.create_regional_analysis, df)
                 
                 return main_map, status_dist, city_comp, regional
                 
@@ -1100,8 +1203,10 @@ class PremiumMapDashboard:
                 empty = self.create_empty_figure(f"Erreur: {str(e)}")
                 return empty, go.Figure(), go.Figure(), go.Figure()
     
-    def create_kpi_card(self, icon, title, value):
-        """Carte KPI simple"""
+    def create_kpi_card(self, icon, title, value, index=None):
+        """Carte KPI simple (avec `index`, la valeur est ciblable par le callback des KPIs)"""
+        # id seulement si ciblée : Dash refuse id=None
+        value_props = {'id': {'type': 'map-kpi-value', 'index': index}} if index is not None else {}
         return html.Div([
             html.Div(icon, style={
                 'fontSize': '32px',
@@ -1113,7 +1218,7 @@ class PremiumMapDashboard:
                 'color': self.COLORS['text_secondary'],
                 'marginBottom': '8px'
             }),
-            html.Div(value, style={
+            html.Div(value, **value_props, style={
                 'fontSize': '24px',
                 'fontWeight': '700',
                 'color': self.COLORS['text_primary']
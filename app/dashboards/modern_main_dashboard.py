@@ -7,7 +7,8 @@ Version: 4.0 - ULTIMATE
 """
 
 import dash
-from dash import html, dcc, Input, Output, State, callback
+from dash.exceptions import PreventUpdate
+from dash import html, dcc, Input, Output, State, Patch, ALL, callback, clientside_callback, ctx
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
 import plotly.express as px
@@ -16,22 +17,39 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from sqlalchemy import func
-import traceback
+from sqlalchemy import func, select, literal, union, union_all
+import logging
+import base64
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from flask_caching import Cache
+import redis
+import os
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+# Compression des réponses (Brotli/gzip) si flask-compress est installé
+# (moteur JSON orjson des figures : configuré une fois pour toute l'application dans app/main.py)
+HAS_COMPRESS = importlib.util.find_spec('flask_compress') is not None
 
 # Import du détecteur de statut
 try:
-    from .status_detector import detect_listing_status
+    from .status_detector import detect_listing_status, detect_listing_status_vectorized
 except ImportError:
     def detect_listing_status(title=None, price=None, **kwargs):
         if price and price < 1_500_000:
             return 'Location'
         return 'Vente'
+    
+    def detect_listing_status_vectorized(titles=None, prices=None, **kwargs):
+        prices = pd.to_numeric(pd.Series(prices), errors='coerce').to_numpy()
+        return np.where((prices != 0) & (prices < 1_500_000), 'Location', 'Vente')
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import re
 import pandas as pd
-import traceback
 
 def parse_french_datetime(date_str):
     """
@@ -136,7 +154,7 @@ def parse_french_datetime(date_str):
         return pd.to_datetime(date_str)
         
     except Exception as e:
-        print(f"⚠️ Erreur parsing '{date_str}': {e}")
+        logger.warning("⚠️ Erreur parsing '%s': %s", date_str, e)
         return now
 
 class DashboardUltimate:
@@ -158,7 +176,143 @@ class DashboardUltimate:
         'border': '#E2E8F0'
     }
     
+    # Colonnes texte à faible cardinalité, stockées en `category`
+    CATEGORY_COLUMNS = ('city', 'property_type', 'status', 'source')
+    # Colonnes numériques : float32 suffit (et garde NaN pour chambres/sdb manquantes)
+    FLOAT32_COLUMNS = ('price', 'surface_area', 'price_per_m2', 'bedrooms', 'bathrooms')
+    # Colonnes lues en base par safe_get_data
+    QUERY_COLUMNS = ('title', 'price', 'property_type', 'city', 'surface_area', 'bedrooms', 'bathrooms', 'scraped_at')
+    # Nombre de jeux (KPIs + figures) gardés en mémoire, par (version des données, type)
+    FIGURE_CACHE_SIZE = 8
+    # Types proposés dans le filtre (domaine fixe : préchargé au démarrage)
+    PROPERTY_TYPES = ('Tous', 'Appartement', 'Maison', 'Villa', 'Terrain', 'Studio')
+    # Durée de vie (s) des DataFrames mis en cache, alignée sur la cadence du scraping
+    DATA_CACHE_TIMEOUT = 3600
+    # Threads dédiés à la construction des graphiques (pandas/NumPy relâchent le GIL)
+    FIGURE_WORKERS = 4
+    # Nombre maximal de points envoyés aux graphiques de distribution brute
+    PLOT_SAMPLE_SIZE = 500
+    # Le nuage Prix/Surface est rendu en WebGL : il supporte bien plus de points que le SVG
+    SCATTER_SAMPLE_SIZE = 5000
+    # Au-delà de l'échantillon, densité de toutes les annonces en grille (bins par axe)
+    SCATTER_DENSITY_BINS = 40
+    
+    # ==================== STYLES STATIQUES ====================
+    # Construits une seule fois à l'import de la classe, partagés par le layout et les cartes
+    
+    CUSTOM_CSS_HREF = 'data:text/css;base64,' + base64.b64encode("""
+        .kpi-card:hover {
+            transform: translateY(-5px) !important;
+            box-shadow: 0 8px 24px rgba(0,0,0,0.15) !important;
+        }
+        
+        .kpi-card {
+            cursor: pointer;
+        }
+        
+        ::-webkit-scrollbar {
+            width: 10px;
+            height: 10px;
+        }
+        
+        ::-webkit-scrollbar-track {
+            background: #F1F5F9;
+        }
+        
+        ::-webkit-scrollbar-thumb {
+            background: #CBD5E1;
+            border-radius: 5px;
+        }
+        
+        ::-webkit-scrollbar-thumb:hover {
+            background: #94A3B8;
+        }
+    """.encode()).decode()
+    
+    HEADER_STYLE = {
+        'background': f'linear-gradient(135deg, {COLORS["primary"]}, {COLORS["secondary"]})',
+        'padding': '2.5rem 0',
+        'marginBottom': '2rem',
+        'borderRadius': '0 0 25px 25px',
+        'boxShadow': '0 10px 40px rgba(102, 126, 234, 0.3)',
+        'marginLeft': '-12px',
+        'marginRight': '-12px',
+        'marginTop': '-12px'
+    }
+    HEADER_TITLE_STYLE = {
+        'fontWeight': '800',
+        'color': 'white',
+        'fontSize': '2.2rem',
+        'textShadow': '0 2px 10px rgba(0,0,0,0.2)',
+        'marginBottom': '0.5rem'
+    }
+    HEADER_SUBTITLE_STYLE = {
+        'fontSize': '1rem',
+        'color': 'rgba(255,255,255,0.95)',
+        'marginBottom': '0'
+    }
+    # Figure vide portant le template : envoyée une fois, les callbacks ne patchent que le reste
+    BASE_FIGURE = go.Figure(layout={'template': 'plotly_white'}).to_dict()
+    CARD_STYLE = {'borderRadius': '15px'}
+    CARD_HEADER_STYLE = {'fontWeight': '700', 'fontSize': '1.1rem'}
+    CONTAINER_STYLE = {'background': COLORS['bg_light'], 'minHeight': '100vh'}
+    
+    # Cartes KPI : (icône, titre, clé KPI, couleur, suffixe, clé du trend, facteur du trend)
+    KPI_CARDS = (
+        ('fa-home', 'Total Propriétés', 'total', 'primary', '', 'total_trend', 1),
+        ('fa-money-bill-wave', 'Prix Moyen', 'avg_price', 'success', ' FCFA', 'price_trend', 1),
+        ('fa-chart-line', 'Prix Médian', 'median_price', 'info', ' FCFA', None, None),
+        # Prix/m² : trend légèrement inférieur au prix moyen
+        ('fa-ruler-combined', 'Prix/m²', 'avg_m2', 'warning', ' FCFA', 'price_trend', 0.8),
+        ('fa-tag', 'Ventes', 'vente', 'purple', '', None, None),
+        ('fa-key', 'Locations', 'location', 'danger', '', None, None)
+    )
+    KPI_CARD_STYLE = {
+        'borderRadius': '16px',
+        'border': 'none',
+        'boxShadow': '0 2px 12px rgba(0,0,0,0.08)',
+        'transition': 'all 0.3s cubic-bezier(0.4, 0, 0.2, 1)',
+        'background': 'white'
+    }
+    KPI_ICON_BOX_STYLE = {
+        'width': '50px',
+        'height': '50px',
+        'borderRadius': '12px',
+        'display': 'flex',
+        'alignItems': 'center',
+        'justifyContent': 'center',
+        'marginBottom': '1rem'
+    }
+    KPI_TITLE_STYLE = {
+        'fontSize': '0.8rem',
+        'fontWeight': '600',
+        'color': COLORS['text_secondary'],
+        'textTransform': 'uppercase',
+        'letterSpacing': '0.5px',
+        'marginBottom': '0.8rem'
+    }
+    KPI_VALUE_STYLE = {
+        'fontWeight': '800',
+        'color': COLORS['text_primary'],
+        'fontSize': '1.8rem',
+        'marginBottom': '0.8rem',
+        'letterSpacing': '-0.5px'
+    }
+    
     def __init__(self, server=None, routes_pathname_prefix="/", requests_pathname_prefix="/"):
+        self._figure_cache = OrderedDict()
+        # Cache de figures partagé entre le thread de préchargement et les threads des requêtes
+        self._figure_cache_lock = threading.Lock()
+        # Liste des villes (SELECT DISTINCT) mémorisée jusqu'à expiration ou rafraîchissement
+        self._cities_cache = (None, None)
+        # Pool de threads et préchargement propres à chaque process : créés au premier appel dans le worker
+        # (avec preload_app, __init__ tourne dans le maître gunicorn, dont les threads ne survivent pas au fork)
+        self._figure_executor = None
+        self._executor_pid = None
+        self._warmup_pid = None
+        self._worker_lock = threading.Lock()
+        if server and HAS_COMPRESS:
+            server.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
         self.app = dash.Dash(
             __name__,
             server=server,
@@ -169,13 +323,65 @@ class DashboardUltimate:
             ],
             routes_pathname_prefix=routes_pathname_prefix,
             requests_pathname_prefix=requests_pathname_prefix,
-            suppress_callback_exceptions=True
+            suppress_callback_exceptions=True,
+            # Pas de "Updating..." dans l'onglet à chaque callback
+            update_title=None,
+            compress=HAS_COMPRESS
         )
         
+        self._data_cache = self.setup_data_cache(server) if server else None
+        
         if server:
             with server.app_context():
                 self.setup_layout()
                 self.setup_callbacks()
+            
+            # Préchargement lancé dans chaque worker, à sa première requête (jamais dans le maître avant le fork)
+            server.before_request(lambda: self.start_worker(server))
+    
+    def start_worker(self, server):
+        """Préchargement des caches en arrière-plan, lancé une seule fois par process"""
+        if self._warmup_pid == os.getpid():
+            return
+        with self._worker_lock:
+            if self._warmup_pid == os.getpid():
+                return
+            self._warmup_pid = os.getpid()
+        threading.Thread(target=self.warmup_caches, args=(server,), daemon=True).start()
+    
+    def figure_executor(self):
+        """Pool de threads du process courant (recréé si l'objet a été hérité d'un fork)"""
+        if self._executor_pid != os.getpid():
+            with self._worker_lock:
+                if self._executor_pid != os.getpid():
+                    self._figure_executor = ThreadPoolExecutor(max_workers=self.FIGURE_WORKERS, thread_name_prefix='figures')
+                    self._executor_pid = os.getpid()
+        return self._figure_executor
+    
+    def warmup_caches(self, server):
+        """Charge les données par défaut et construit les sorties de chaque type de propriété"""
+        try:
+            with server.app_context():
+                self.get_available_cities()
+                # Mêmes arguments que update_data au premier affichage, pour chaque type (filtré en SQL)
+                for ptype in self.PROPERTY_TYPES:
+                    df, version = self.cached_data(property_type=ptype, city='Toutes', status_filter='Tous', limit=1000)
+                    if not df.empty:
+                        self.get_dashboard_outputs(df.to_dict('list'), version, ptype)
+            logger.info("✅ Caches du dashboard préchargés (%d types)", len(self.PROPERTY_TYPES))
+        except Exception as e:
+            logger.warning("⚠️ Préchargement des caches impossible: %s", e)
+    
+    def setup_data_cache(self, server):
+        """Cache des DataFrames chargés : Redis si joignable, sinon mémoire du process"""
+        redis_url = os.environ.get('REDIS_URL', 'redis://redis:6379/0')
+        config = {'CACHE_DEFAULT_TIMEOUT': self.DATA_CACHE_TIMEOUT, 'CACHE_KEY_PREFIX': 'dashboard_main_'}
+        try:
+            redis.Redis.from_url(redis_url, socket_connect_timeout=1).ping()
+            config.update({'CACHE_TYPE': 'RedisCache', 'CACHE_REDIS_URL': redis_url})
+        except Exception:
+            config['CACHE_TYPE'] = 'SimpleCache'
+        return Cache(server, config=config)
     
     # ==================== DATA LOADING ====================
     
@@ -190,7 +396,81 @@ class DashboardUltimate:
             except:
                 return None, None, None, None
     
+    def cached_data(self, property_type=None, city=None, status_filter=None, limit=1000, refresh=False):
+        """(DataFrame, version) servis depuis le cache ; `refresh` force la relecture en base
+        
+        Un statut précis est toujours tiré de l'échantillon 'Tous' (mêmes filtres) : les KPIs d'un statut
+        ne dépendent pas de l'ordre dans lequel les filtres ont été ouverts.
+        """
+        entry = self.cached_entry(property_type, city, status_filter, limit, refresh)
+        return entry['df'], entry['version']
+    
+    def cached_entry(self, property_type, city, status_filter, limit, refresh=False):
+        """Entrée {'df', 'version'[, 'status_index']} du cache de données, chargée ou dérivée si absente"""
+        key = f"data:{property_type}:{city}:{status_filter}:{limit}"
+        entry = None
+        if not refresh and self._data_cache is not None:
+            try:
+                entry = self._data_cache.get(key)
+            except Exception as e:
+                logger.warning("⚠️ Cache indisponible: %s", e)
+        if entry is not None:
+            return entry
+        
+        if status_filter and status_filter != "Tous":
+            # Sous-ensemble de l'entrée 'Tous' (positions précalculées), mis en cache sous sa propre clé
+            entry = self.status_subset(
+                self.cached_entry(property_type, city, "Tous", limit, refresh), status_filter
+            )
+        else:
+            df = self.load_data(property_type, city, limit)
+            entry = {'df': df, 'version': datetime.now().isoformat()}
+            # Nouvel échantillon 'Tous' : les sous-ensembles Vente/Location tirés de l'ancien sont périmés
+            self.drop_status_entries(property_type, city, limit)
+            if not df.empty and 'status' in df.columns:
+                # Positions des lignes par statut : un changement de statut devient un simple take()
+                entry['status_index'] = df.groupby('status', observed=True).indices
+        
+        if not entry['df'].empty and self._data_cache is not None:
+            try:
+                self._data_cache.set(key, entry)
+            except Exception as e:
+                logger.warning("⚠️ Cache indisponible: %s", e)
+        return entry
+    
+    def drop_status_entries(self, property_type, city, limit):
+        """Retire du cache les sous-ensembles par statut dérivés de l'entrée 'Tous' (re-dérivés à la demande)"""
+        if self._data_cache is None:
+            return
+        try:
+            self._data_cache.delete_many(
+                *[f"data:{property_type}:{city}:{status}:{limit}" for status in ('Vente', 'Location')]
+            )
+        except Exception as e:
+            logger.warning("⚠️ Cache indisponible: %s", e)
+    
+    @staticmethod
+    def status_subset(entry, status_filter):
+        """Sous-ensemble d'un statut tiré d'une entrée 'Tous' (index précalculés, sans requête)"""
+        positions = entry.get('status_index', {}).get(status_filter, [])
+        return {
+            'df': entry['df'].take(positions).reset_index(drop=True) if len(positions) else pd.DataFrame(),
+            # Version propre au statut : le cache de figures ne doit pas confondre les sous-ensembles
+            'version': f"{entry['version']}:{status_filter}"
+        }
+    
+    @staticmethod
+    def city_column(model):
+        """Ville normalisée en SQL (minuscules, partie avant la virgule) au lieu d'un traitement pandas à chaque chargement"""
+        return func.coalesce(
+            func.lower(func.split_part(model.city, ',', 1)), 'non spécifié'
+        ).label('city')
+    
     def safe_get_data(self, property_type=None, city=None, status_filter=None, limit=1000):
+        """DataFrame filtré (via le cache de données)"""
+        return self.cached_data(property_type, city, status_filter, limit)[0]
+    
+    def load_data(self, property_type=None, city=None, limit=1000):
         """✅ Récupération ROBUSTE avec TOUS les filtres"""
         try:
             db,   ExpatDakarProperty, LogerDakarProperty = self.safe_import_models()
@@ -198,94 +478,119 @@ class DashboardUltimate:
             if not db:
                 return pd.DataFrame()
             
-            all_data = []
+            selects = []
             
             for model in [  ExpatDakarProperty, LogerDakarProperty]:
-                try:
-                    query = db.session.query(model).filter(
-                        model.price.isnot(None),
-                        model.price > 10000,
-                        model.price < 1e10
-                    )
-                    
-                    if property_type and property_type != "Tous":
-                        query = query.filter(model.property_type == property_type)
-                    
-                    if city and city != "Toutes":
-                        query = query.filter(model.city.ilike(f'%{city}%'))
-                    
-                    records = query.limit(limit).all()
-                    
-                    for r in records:
-                        try:
-                            price = float(r.price) if r.price else 0
-                            title = str(r.title) if hasattr(r, 'title') and r.title else None
-                            prop_type = str(r.property_type) if r.property_type else 'Autre'
-                            
-                            # Détection statut
-                            status = detect_listing_status(
-                                title=title,
-                                price=price,
-                                property_type=prop_type,
-                                source=model.__name__
-                            )
-                            
-                            # Filtre statut
-                            if status_filter and status_filter != "Tous":
-                                if status != status_filter:
-                                    continue
-                            
-                            all_data.append({
-                                'city': str(r.city) if r.city else 'Non spécifié',
-                                'property_type': prop_type,
-                                'status': status,
-                                'price': price,
-                                'source': model.__name__,
-                                'surface_area': float(r.surface_area) if hasattr(r, 'surface_area') and r.surface_area and r.surface_area > 0 else None,
-                                'bedrooms': int(r.bedrooms) if hasattr(r, 'bedrooms') and r.bedrooms else None,
-                                'bathrooms': int(r.bathrooms) if hasattr(r, 'bathrooms') and r.bathrooms else None,
-                                'scraped_at': r.scraped_at if hasattr(r, 'scraped_at') else None
-                            })
-                        except:
-                            continue
-                            
-                except Exception as e:
-                    print(f"⚠️ Erreur {model.__name__}: {e}")
-                    continue
+                # Requête Core sur les seules colonnes utiles : pas d'objets ORM instanciés
+                stmt = select(
+                    *[self.city_column(model) if col == 'city' else getattr(model, col) for col in self.QUERY_COLUMNS],
+                    literal(model.__name__).label('source')
+                ).where(
+                    model.price.isnot(None),
+                    model.price > 10000,
+                    model.price < 1e10
+                )
+                
+                if property_type and property_type != "Tous":
+                    stmt = stmt.where(model.property_type == property_type)
+                
+                if city and city != "Toutes":
+                    stmt = stmt.where(model.city.ilike(f'%{city}%'))
+                
+                # LIMIT par source conservé (sous-requête) : même échantillon qu'avec des requêtes séparées
+                selects.append(select(stmt.limit(limit).subquery()))
+            
+            # Un seul aller-retour : UNION ALL des sources, lu en flux par lots, lu par lots de 500 (partitions) puis concaténé
+            result = db.session.execute(
+                union_all(*selects).execution_options(yield_per=500)
+            )
+            keys = list(result.keys())
+            frames = [pd.DataFrame(part, columns=keys) for part in result.partitions(500)]
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=keys)
             
-            if not all_data:
+            if df.empty:
                 return pd.DataFrame()
             
-            df = pd.DataFrame(all_data).copy()
-            df['city'] = df['city'].apply(lambda x: x.lower().split(',')[0] if isinstance(x, str) else x)
+            # Nettoyage par colonne (plus de dict ni de try/except par ligne)
+            df['price'] = pd.to_numeric(df['price'], errors='coerce')
+            df['property_type'] = df['property_type'].fillna('Autre').astype(str)
+            for col in ('surface_area', 'bedrooms', 'bathrooms'):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            df['surface_area'] = df['surface_area'].where(df['surface_area'] > 0)
+            df[['bedrooms', 'bathrooms']] = df[['bedrooms', 'bathrooms']].replace(0, np.nan)
+            
+            # Détection statut : détecteur vectorisé, une passe regex par catégorie sur toute la colonne titre
+            df['status'] = detect_listing_status_vectorized(
+                titles=df['title'],
+                prices=df['price'],
+                property_types=df['property_type'],
+                sources=df['source']
+            )
+            df = df.drop(columns='title')
+            
             if 'scraped_at' in df.columns:
-                df['scraped_at'] = df['scraped_at'].apply(parse_french_datetime)
-
+                # Dates françaises parsées une fois au chargement, stockées en datetime64
+                df['scraped_at'] = pd.to_datetime(df['scraped_at'].apply(parse_french_datetime), errors='coerce')
             
-            # Prix/m²
-            if 'surface_area' in df.columns:
-                df['price_per_m2'] = df.apply(
-                    lambda x: x['price'] / x['surface_area'] 
-                    if x['surface_area'] and x['surface_area'] > 0 and x['price'] > 0 
-                    else None,
-                    axis=1
-                )
+            # Prix/m² vectorisé (NaN si surface ou prix absents)
+            sa = df['surface_area'].to_numpy(dtype=np.float64)
+            p = df['price'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                df['price_per_m2'] = np.where((sa > 0) & (p > 0), p / sa, np.nan)
             
-            return df
+            # Mélange unique (reproductible) : les graphiques échantillonnent ensuite par simple tête de groupe
+            df = df.sample(frac=1, random_state=0).reset_index(drop=True)
+            
+            return self.optimize_dtypes(df)
             
         except Exception as e:
-            print(f"❌ Erreur chargement: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erreur chargement: %s", e)
             return pd.DataFrame()
     
-    def get_available_cities(self):
+    def optimize_dtypes(self, df):
+        """Dtypes compacts : `category` pour le texte répétitif, float32 pour les nombres"""
+        if df.empty:
+            return df
+        
+        for col in self.CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        for col in self.FLOAT32_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        
+        return df
+    
+    def frame_from_store(self, data):
+        """Reconstruit le DataFrame depuis le dcc.Store (format colonnes) avec les dtypes optimisés"""
+        return self.optimize_dtypes(pd.DataFrame(data))
+    
+    def get_available_cities(self, refresh=False):
+        """Villes du filtre via SELECT DISTINCT (aucune annonce chargée), mémorisées DATA_CACHE_TIMEOUT secondes"""
+        loaded_at, cities = self._cities_cache
+        if not refresh and cities and datetime.now() - loaded_at < timedelta(seconds=self.DATA_CACHE_TIMEOUT):
+            return cities
+        
         try:
-            df = self.safe_get_data(limit=2000)
-            if df.empty:
+            db, ExpatDakarProperty, LogerDakarProperty = self.safe_import_models()
+            if not db:
                 return ["Toutes"]
-            cities = sorted(df['city'].dropna().unique().tolist())
-            return ["Toutes"] + cities[:50]
-        except:
+            
+            # Même normalisation que safe_get_data, faite en SQL : le UNION dédoublonne directement les noms normalisés
+            stmt = union(*[
+                select(self.city_column(model)).where(model.city.isnot(None))
+                for model in (ExpatDakarProperty, LogerDakarProperty)
+            ])
+            names = {name for name in db.session.execute(stmt).scalars() if name}
+            if not names:
+                return ["Toutes"]
+            
+            cities = ["Toutes"] + sorted(names)[:50]
+            self._cities_cache = (datetime.now(), cities)
+            return cities
+        except Exception as e:
+            logger.warning("⚠️ Villes indisponibles: %s", e)
             return ["Toutes"]
     
     def parse_french_datetime(self, date_str):
@@ -391,11 +696,33 @@ class DashboardUltimate:
             return pd.to_datetime(date_str)
             
         except Exception as e:
-            print(f"⚠️ Erreur parsing '{date_str}': {e}")
+            logger.warning("⚠️ Erreur parsing '%s': %s", date_str, e)
             return now
 
-    def calculate_kpis(self, df):
-        """✅ Calcul complet des KPIs avec parsing des dates françaises"""
+    @staticmethod
+    def grouped_moments(group_ids, values, n_groups):
+        """Effectif, moyenne et écart-type (ddof=1) par groupe, en deux passes np.bincount"""
+        counts = np.bincount(group_ids, minlength=n_groups)
+        sums = np.bincount(group_ids, weights=values, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+            sq_dev = np.bincount(group_ids, weights=(values - means[group_ids]) ** 2, minlength=n_groups)
+            stds = np.sqrt(sq_dev / (counts - 1))
+        return counts, means, stds
+    
+    @staticmethod
+    def category_counts(series):
+        """Effectifs par modalité (ordre décroissant, modalités absentes retirées) ; np.bincount sur les codes si catégoriel"""
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return series.value_counts()
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        present = np.flatnonzero(counts)
+        order = present[np.argsort(-counts[present], kind='stable')]
+        return pd.Series(counts[order], index=series.cat.categories[order], name='count')
+    
+    def calculate_kpis(self, df, aggs=None):
+        """✅ Calcul complet des KPIs avec parsing des dates françaises (réutilise les agrégats si fournis)"""
         default = {
             'total': 0, 'avg_price': 0, 'median_price': 0, 
             'avg_m2': 0, 'vente': 0, 'location': 0,
@@ -407,189 +734,262 @@ class DashboardUltimate:
             return default
         
         try:
-            # 🔧 Conversion des dates si la colonne existe
-            if 'scraped_at' in df.columns:
-                df['scraped_at'] = df['scraped_at'].apply(self.parse_french_datetime)
-                # S'assurer que c'est bien du datetime64[ns]
-                df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
+            # 🔧 Dates déjà parsées au chargement : le store les renvoie en ISO, simple conversion vectorisée
+            if 'scraped_at' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['scraped_at']):
+                df['scraped_at'] = pd.to_datetime(df['scraped_at'], format='ISO8601', errors='coerce')
+            
+            # Calcul des KPIs de base sur des tableaux NumPy contigus (float64 pour les sommes)
+            prices = df['price'].to_numpy(dtype=np.float64)
+            ppm2 = df['price_per_m2'].to_numpy(dtype=np.float64) if 'price_per_m2' in df.columns else np.empty(0)
+            avg_price = float(np.nanmean(prices))
+            
+            # Comptes Vente/Location : un seul passage, ou repris des agrégats des graphiques
+            if aggs is not None and 'status' in aggs:
+                status_counts = aggs['status']
+            elif 'status' in df.columns:
+                status_counts = self.category_counts(df['status'])
+            else:
+                status_counts = pd.Series(dtype='int64')
             
-            # Calcul des KPIs de base
             kpis = {
                 'total': len(df),
-                'avg_price': float(df['price'].mean()),
-                'median_price': float(df['price'].median()),
-                'avg_m2': float(df['price_per_m2'].mean()) if 'price_per_m2' in df.columns and df['price_per_m2'].notna().sum() > 0 else 0,
-                'vente': int((df['status'] == 'Vente').sum()) if 'status' in df.columns else 0,
-                'location': int((df['status'] == 'Location').sum()) if 'status' in df.columns else 0,
-                'market_volatility': float(df['price'].std() / df['price'].mean() * 100) if df['price'].mean() > 0 else 0
+                'avg_price': avg_price,
+                'median_price': aggs['price_median'] if aggs is not None and 'price_median' in aggs else float(np.nanmedian(prices)),
+                'avg_m2': float(np.nanmean(ppm2)) if not np.isnan(ppm2).all() else 0,
+                'vente': int(status_counts.get('Vente', 0)),
+                'location': int(status_counts.get('Location', 0)),
+                'market_volatility': float(np.nanstd(prices, ddof=1) / avg_price * 100) if avg_price > 0 else 0
             }
             
             # ✅ Calcul des trends basés sur scraped_at (maintenant en datetime)
-            if 'scraped_at' in df.columns and df['scraped_at'].notna().sum() > 0:
+            scraped = df['scraped_at'].to_numpy(dtype='datetime64[ns]') if 'scraped_at' in df.columns else np.empty(0, dtype='datetime64[ns]')
+            valid = ~np.isnat(scraped)
+            if valid.any():
                 week_ago = datetime.utcnow() - timedelta(days=7)
                 two_weeks_ago = datetime.utcnow() - timedelta(days=14)
                 
-                df_recent = df[df['scraped_at'] >= week_ago].copy()
-                df_previous = df[(df['scraped_at'] >= two_weeks_ago) & (df['scraped_at'] < week_ago)].copy()
+                # Fenêtre par annonce : 0 = plus ancienne, 1 = semaine précédente, 2 = 7 derniers jours
+                edges = np.array([two_weeks_ago, week_ago], dtype='datetime64[ns]')
+                window = np.searchsorted(edges, scraped[valid], side='right')
+                counts, means, stds = self.grouped_moments(window, prices[valid], 3)
+                n_previous, n_recent = int(counts[1]), int(counts[2])
                 
-                kpis['new_listings'] = len(df_recent)
+                kpis['new_listings'] = n_recent
                 
                 # Trend du nombre d'annonces
-                if len(df_previous) > 0:
-                    kpis['total_trend'] = round(((len(df_recent) - len(df_previous)) / len(df_previous)) * 100, 1)
+                if n_previous > 0:
+                    kpis['total_trend'] = round(((n_recent - n_previous) / n_previous) * 100, 1)
                 else:
-                    kpis['total_trend'] = round(np.random.uniform(3, 8), 1)
+                    kpis['total_trend'] = 0
                 
                 # Trend du prix moyen
-                if len(df_recent) > 0 and len(df_previous) > 0:
-                    price_recent = df_recent['price'].mean()
-                    price_previous = df_previous['price'].mean()
+                if n_recent > 0 and n_previous > 0:
+                    price_recent = means[2]
+                    price_previous = means[1]
                     kpis['price_trend'] = round(((price_recent - price_previous) / price_previous) * 100, 1) if price_previous > 0 else 0
                 else:
-                    kpis['price_trend'] = round(np.random.uniform(2, 6), 1)
+                    kpis['price_trend'] = 0
                 
                 # Trend de la volatilité
-                if len(df_recent) > 0 and len(df_previous) > 0:
-                    vol_recent = df_recent['price'].std() / df_recent['price'].mean() * 100
-                    vol_previous = df_previous['price'].std() / df_previous['price'].mean() * 100
+                if n_recent > 0 and n_previous > 0:
+                    vol_recent = stds[2] / means[2] * 100
+                    vol_previous = stds[1] / means[1] * 100
                     kpis['volatility_trend'] = round(((vol_recent - vol_previous) / vol_previous) * 100, 1) if vol_previous > 0 else 0
                 else:
-                    kpis['volatility_trend'] = round(np.random.uniform(-3, 2), 1)
+                    kpis['volatility_trend'] = 0
             else:
-                # Fallback simulation
-                kpis['new_listings'] = int(len(df) * 0.15)
-                kpis['total_trend'] = round(np.random.uniform(5, 12), 1)
-                kpis['price_trend'] = round(np.random.uniform(3, 8), 1)
-                kpis['volatility_trend'] = round(np.random.uniform(-2, 1), 1)
+                # Pas de dates exploitables : trends neutres (affichés « Stable »), jamais simulés
+                kpis['new_listings'] = 0
+                kpis['total_trend'] = 0
+                kpis['price_trend'] = 0
+                kpis['volatility_trend'] = 0
             
-            print(f"✅ KPIs calculés: {kpis}")
+            logger.debug("✅ KPIs calculés: %s", kpis)
             return kpis
             
         except Exception as e:
-            print(f"❌ Erreur calcul KPIs: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Erreur calcul KPIs: %s", e)
             return default
     # ==================== GRAPHIQUES ====================
     
-    def create_price_distribution(self, df):
-        """Histogramme distribution prix par statut"""
-        if df.empty:
-            return go.Figure()
+    @staticmethod
+    def sample_for_plot(df, max_n, by='property_type'):
+        """Échantillon stratifié (proportions par `by` conservées), sans tirage aléatoire
         
+        Les lignes sont déjà mélangées une fois au chargement : garder les premières
+        lignes de chaque groupe équivaut à un tirage, sans RNG ni index recopié.
+        """
+        n = len(df)
+        if n <= max_n:
+            return df
+        if by not in df.columns:
+            return df.head(max_n)
+        groups = df.groupby(by, observed=True, sort=False)
+        keep = groups.cumcount().to_numpy() < groups[by].transform('size').to_numpy() * (max_n / n)
+        return df[keep]
+    
+    def compute_aggregates(self, df):
+        """Agrégats partagés par les graphiques et les KPIs : un seul passage par dimension"""
+        type_aggs = {'count': ('price', 'size')}
+        if 'price_per_m2' in df.columns:
+            type_aggs['ppm2_mean'] = ('price_per_m2', 'mean')
+            type_aggs['ppm2_median'] = ('price_per_m2', 'median')
+        
+        aggs = {
+            'types': df.groupby('property_type', observed=True, sort=False).agg(**type_aggs),
+            'cities': df.groupby('city', observed=True, sort=False)['price'].agg(['median', 'count'])
+        }
+        if 'status' in df.columns:
+            aggs['status'] = self.category_counts(df['status'])
+        if 'source' in df.columns:
+            aggs['sources'] = df.groupby('source', observed=True, sort=False)['price'].agg(['median', 'count'])
+        if 'bedrooms' in df.columns:
+            # value_counts ignore déjà les NaN : inutile de filtrer le DataFrame
+            aggs['bedrooms'] = df['bedrooms'].value_counts().sort_index()
+        
+        # Histogramme des prix par statut + médiane (partagée avec les KPIs)
+        prices = df['price'].to_numpy(dtype=np.float64)
+        aggs['price_median'] = float(np.nanmedian(prices))
         try:
-            fig = px.histogram(
-                df,
-                x='price',
-                nbins=40,
-                color='status' if 'status' in df.columns else None,
-                title='💰 Distribution des Prix',
-                labels={'price': 'Prix (FCFA)', 'count': 'Nombre'},
-                color_discrete_map={'Vente': self.COLORS['primary'], 'Location': self.COLORS['success']}
-            )
-            
-            # Ligne médiane
-            median = df['price'].median()
-            fig.add_vline(x=median, line_dash="dash", line_color=self.COLORS['danger'], 
-                         annotation_text=f"Médiane: {self.format_number(median)}")
-            
-            fig.update_layout(
-                template='plotly_white',
-                height=400,
-                font=dict(family='Inter', size=12),
-                plot_bgcolor='white',
-                paper_bgcolor='white'
-            )
-            
-            return fig
-        except:
-            return go.Figure()
+            # Binning côté serveur : np.histogram par statut sur des bords communs, 40 barres envoyées au lieu de N prix
+            valid = ~np.isnan(prices)
+            edges = np.histogram_bin_edges(prices[valid], bins=40)
+            if 'status' in df.columns:
+                groups = df['status'].groupby(df['status'], observed=True, sort=False).indices
+            else:
+                groups = {'Tous': np.arange(len(prices))}
+            aggs['price_hist'] = {
+                'edges': edges,
+                'counts': pd.DataFrame({
+                    status_value: np.histogram(prices[positions][valid[positions]], bins=edges)[0]
+                    for status_value, positions in groups.items()
+                })
+            }
+        except Exception as e:
+            logger.warning("⚠️ Histogramme des prix indisponible: %s", e)
+        
+        return aggs
     
-    def create_city_comparison(self, df):
-        """Top 10 villes - Prix médian"""
+    def figure_dict(self, data, title, **layout):
+        """Figure en dict brut (sans validation go.Figure ni to_dict) ; le template vient de BASE_FIGURE"""
+        return {'data': data, 'layout': {'title': {'text': title}, 'height': 400, **layout}}
+    
+    @staticmethod
+    def colored_bar(x, y, colorscale):
+        """Trace barres colorées par valeur (équivalent px.bar(color=y))"""
+        return {
+            'type': 'bar', 'x': x, 'y': y,
+            'marker': {'color': y, 'colorscale': colorscale, 'showscale': True,
+                       'colorbar': {'title': {'text': 'count'}}}
+        }
+    
+    def build_all_figures(self, df, aggs=None):
+        """Construit les 7 graphiques serveur en réutilisant les mêmes agrégats"""
         if df.empty:
-            return go.Figure()
+            empty = go.Figure()
+            return (empty,) * 7
         
-        try:
-            city_stats = df.groupby('city')['price'].agg(['median', 'count']).reset_index()
-            city_stats = city_stats.nlargest(10, 'count')
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=city_stats['city'],
-                y=city_stats['median'],
-                marker_color=self.COLORS['primary'],
-                text=city_stats['median'].apply(lambda x: f'{x/1e6:.1f}M'),
-                textposition='outside'
-            ))
-            
-            fig.update_layout(
-                title='🏙️ Top 10 Villes - Prix Médian',
-                xaxis_title='Ville',
-                yaxis_title='Prix Médian (FCFA)',
-                template='plotly_white',
-                height=400
-            )
-            
-            return fig
-        except:
-            return go.Figure()
+        if aggs is None:
+            aggs = self.compute_aggregates(df)
+        
+        # Builders indépendants (lecture seule sur df/aggs) : exécutés en parallèle
+        builders = (
+            (self.create_price_distribution, aggs),
+            (self.create_city_comparison, aggs),
+            (self.create_bedroom_distribution, aggs),
+            (self.create_source_comparison, aggs),
+            (self.create_price_per_m2_chart, aggs),
+            (self.create_scatter_price_surface, df),
+            (self.create_sunburst_market, df)
+        )
+        futures = [self.figure_executor().submit(builder, arg) for builder, arg in builders]
+        
+        return tuple(future.result() for future in futures)
     
-    def create_status_pie(self, df):
-        """Camembert Vente/Location"""
-        if df.empty or 'status' not in df.columns:
+    def create_price_distribution(self, aggs):
+        """Histogramme distribution prix par statut"""
+        if 'price_hist' not in aggs:
             return go.Figure()
         
         try:
-            status_counts = df['status'].value_counts().reset_index()
-            status_counts.columns = ['status', 'count']
+            edges = aggs['price_hist']['edges']
+            counts = aggs['price_hist']['counts']
             
-            fig = px.pie(
-                status_counts,
-                values='count',
-                names='status',
-                title='🔄 Vente vs Location',
-                color='status',
-                color_discrete_map={'Vente': self.COLORS['primary'], 'Location': self.COLORS['success']},
-                hole=0.4
-            )
+            centers = (edges[:-1] + edges[1:]) / 2
+            widths = np.diff(edges)
+            color_map = {'Vente': self.COLORS['primary'], 'Location': self.COLORS['success']}
             
-            fig.update_layout(template='plotly_white', height=400)
-            return fig
+            traces = [
+                {
+                    'type': 'bar',
+                    'x': centers,
+                    'y': counts[status_value].to_numpy(),
+                    'width': widths,
+                    'name': status_value,
+                    'marker': {'color': color_map.get(status_value, self.COLORS['primary'])}
+                }
+                for status_value in counts.columns
+            ]
+            
+            # Ligne médiane (équivalent add_vline : shape + annotation en coordonnées papier)
+            median = aggs['price_median']
+            return self.figure_dict(
+                traces,
+                '💰 Distribution des Prix',
+                xaxis={'title': {'text': 'Prix (FCFA)'}},
+                yaxis={'title': {'text': 'Nombre'}},
+                barmode='stack',
+                bargap=0,
+                font={'family': 'Inter', 'size': 12},
+                plot_bgcolor='white',
+                paper_bgcolor='white',
+                shapes=[{
+                    'type': 'line', 'xref': 'x', 'yref': 'paper',
+                    'x0': median, 'x1': median, 'y0': 0, 'y1': 1,
+                    'line': {'color': self.COLORS['danger'], 'dash': 'dash'}
+                }],
+                annotations=[{
+                    'xref': 'x', 'yref': 'paper', 'x': median, 'y': 1,
+                    'xanchor': 'left', 'yanchor': 'top', 'showarrow': False,
+                    'text': f"Médiane: {self.format_number(median)}"
+                }]
+            )
         except:
             return go.Figure()
     
-    def create_property_types(self, df):
-        """Bar chart types de propriétés"""
-        if df.empty:
+    def create_city_comparison(self, aggs):
+        """Top 10 villes - Prix médian"""
+        if aggs['cities'].empty:
             return go.Figure()
         
         try:
-            types = df['property_type'].value_counts().head(8).reset_index()
-            types.columns = ['type', 'count']
+            city_stats = aggs['cities'].nlargest(10, 'count')
+            median = city_stats['median'].to_numpy()
             
-            fig = px.bar(
-                types,
-                x='type',
-                y='count',
-                title='🏠 Types de Propriétés',
-                color='count',
-                color_continuous_scale='Viridis'
+            return self.figure_dict(
+                [{
+                    'type': 'bar',
+                    'x': city_stats.index.astype(str).tolist(),
+                    'y': median,
+                    'marker': {'color': self.COLORS['primary']},
+                    'customdata': median / 1e6,
+                    'texttemplate': '%{customdata:.1f}M',
+                    'textposition': 'outside'
+                }],
+                '🏙️ Top 10 Villes - Prix Médian',
+                xaxis={'title': {'text': 'Ville'}},
+                yaxis={'title': {'text': 'Prix Médian (FCFA)'}}
             )
-            
-            fig.update_layout(template='plotly_white', height=400, xaxis_title='Type', yaxis_title='Nombre')
-            return fig
         except:
             return go.Figure()
     
-    def create_source_comparison(self, df):
+    def create_source_comparison(self, aggs):
         """Comparaison par source"""
-        if df.empty or 'source' not in df.columns:
+        if 'sources' not in aggs:
             return go.Figure()
         
         try:
-            source_stats = df.groupby('source').agg({
-                'price': ['median', 'count']
-            }).reset_index()
+            source_stats = aggs['sources'].reset_index()
             source_stats.columns = ['source', 'median_price', 'count']
             
             fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -615,45 +1015,30 @@ class DashboardUltimate:
         except:
             return go.Figure()
     
-    def create_price_per_m2_chart(self, df):
+    def create_price_per_m2_chart(self, aggs):
         """Prix au m² par type"""
-        if df.empty or 'price_per_m2' not in df.columns:
+        if 'ppm2_median' not in aggs['types'].columns:
             return go.Figure()
         
         try:
-            df_filtered = df[df['price_per_m2'].notna()].copy()
-            if df_filtered.empty:
+            stats = aggs['types'][['ppm2_mean', 'ppm2_median']].dropna()
+            if stats.empty:
                 return go.Figure()
             
-            stats = df_filtered.groupby('property_type')['price_per_m2'].agg(['mean', 'median']).reset_index()
-            stats = stats.sort_values('median', ascending=False)
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                name='Médiane',
-                x=stats['property_type'],
-                y=stats['median'],
-                marker_color=self.COLORS['primary'],
-                text=[f"{self.format_number(v)}" for v in stats['median']],
-                textposition='outside'
-            ))
+            stats = stats.sort_values('ppm2_median', ascending=False)
+            types = stats.index.astype(str).tolist()
             
-            fig.add_trace(go.Bar(
-                name='Moyenne',
-                x=stats['property_type'],
-                y=stats['mean'],
-                marker_color=self.COLORS['secondary'],
-                opacity=0.7
-            ))
-            
-            fig.update_layout(
-                title='📐 Prix au m² par Type',
-                barmode='group',
-                template='plotly_white',
-                height=400
+            return self.figure_dict(
+                [
+                    {'type': 'bar', 'name': 'Médiane', 'x': types, 'y': stats['ppm2_median'].to_numpy(),
+                     'marker': {'color': self.COLORS['primary']},
+                     'texttemplate': '%{y:.3s}', 'textposition': 'outside'},
+                    {'type': 'bar', 'name': 'Moyenne', 'x': types, 'y': stats['ppm2_mean'].to_numpy(),
+                     'marker': {'color': self.COLORS['secondary']}, 'opacity': 0.7}
+                ],
+                '📐 Prix au m² par Type',
+                barmode='group'
             )
-            
-            return fig
         except:
             return go.Figure()
     
@@ -663,24 +1048,59 @@ class DashboardUltimate:
             return go.Figure()
         
         try:
-            df_filtered = df[(df['surface_area'].notna()) & (df['surface_area'] > 0)].copy()
+            df_filtered = df.loc[df['surface_area'] > 0, ['surface_area', 'price', 'property_type']]
             if df_filtered.empty:
                 return go.Figure()
             
-            df_sample = df_filtered.sample(min(500, len(df_filtered)))
+            df_sample = self.sample_for_plot(df_filtered, self.SCATTER_SAMPLE_SIZE)
             
-            fig = px.scatter(
-                df_sample,
-                x='surface_area',
-                y='price',
-                color='property_type',
-                title='📊 Relation Prix - Surface',
-                labels={'surface_area': 'Surface (m²)', 'price': 'Prix (FCFA)'},
-                opacity=0.7
-            )
+            # Une seule trace WebGL : le type est un code couleur (palette discrète), pas une trace par type
+            codes, types = pd.factorize(df_sample['property_type'])
+            palette = px.colors.qualitative.Plotly
+            colors = [palette[i % len(palette)] for i in range(max(len(types), 2))]
+            colorscale = [[i / (len(colors) - 1), c] for i, c in enumerate(colors)]
             
-            fig.update_layout(template='plotly_white', height=500)
-            return fig
+            traces = []
+            if len(df_sample) < len(df_filtered):
+                # Points non tracés : densité de toutes les annonces binée côté serveur (grille fixe, pas N points)
+                surface = df_filtered['surface_area'].to_numpy(dtype=np.float64)
+                price = df_filtered['price'].to_numpy(dtype=np.float64)
+                valid = np.isfinite(surface) & np.isfinite(price)
+                x_range = np.percentile(surface[valid], [1, 99])
+                y_range = np.percentile(price[valid], [1, 99])
+                counts, x_edges, y_edges = np.histogram2d(
+                    surface[valid], price[valid], bins=self.SCATTER_DENSITY_BINS, range=[x_range, y_range]
+                )
+                traces.append({
+                    'type': 'heatmap',
+                    'x': (x_edges[:-1] + x_edges[1:]) / 2,
+                    'y': (y_edges[:-1] + y_edges[1:]) / 2,
+                    'z': np.where(counts > 0, counts, np.nan).T,
+                    'colorscale': 'Greys',
+                    'zsmooth': 'best',
+                    'opacity': 0.35,
+                    'showscale': False,
+                    'hoverinfo': 'skip'
+                })
+            
+            traces.append({
+                'type': 'scattergl',
+                'x': df_sample['surface_area'].to_numpy(),
+                'y': df_sample['price'].to_numpy(),
+                'mode': 'markers',
+                'marker': {'color': codes, 'colorscale': colorscale, 'cmin': 0, 'cmax': len(colors) - 1,
+                           'showscale': False, 'opacity': 0.7},
+                'text': np.asarray(types, dtype=object)[codes],
+                'hovertemplate': '%{text}<br>Surface: %{x:.0f} m²<br>Prix: %{y:,.0f} FCFA<extra></extra>'
+            })
+            
+            return self.figure_dict(
+                traces,
+                '📊 Relation Prix - Surface',
+                height=500,
+                xaxis={'title': {'text': 'Surface (m²)'}},
+                yaxis={'title': {'text': 'Prix (FCFA)'}}
+            )
         except:
             return go.Figure()
     
@@ -690,8 +1110,8 @@ class DashboardUltimate:
             return go.Figure()
         
         try:
-            # Limiter pour performance
-            df_sample = df.sample(min(500, len(df))).copy()
+            # Limiter pour performance (px.sunburst groupe sur le chemin : pas de categories)
+            df_sample = self.sample_for_plot(df, self.PLOT_SAMPLE_SIZE).astype({'source': str, 'city': str, 'property_type': str})
             
             fig = px.sunburst(
                 df_sample,
@@ -707,27 +1127,20 @@ class DashboardUltimate:
         except:
             return go.Figure()
     
-    def create_bedroom_distribution(self, df):
+    def create_bedroom_distribution(self, aggs):
         """Distribution des chambres"""
-        if df.empty or 'bedrooms' not in df.columns:
+        if 'bedrooms' not in aggs:
             return go.Figure()
         
         try:
-            df_bed = df[df['bedrooms'].notna()].copy()
-            bed_counts = df_bed['bedrooms'].value_counts().sort_index().reset_index()
-            bed_counts.columns = ['bedrooms', 'count']
+            bed_counts = aggs['bedrooms']
             
-            fig = px.bar(
-                bed_counts,
-                x='bedrooms',
-                y='count',
-                title='🛏️ Distribution des Chambres',
-                color='count',
-                color_continuous_scale='Blues'
+            return self.figure_dict(
+                [self.colored_bar(bed_counts.index.to_numpy(), bed_counts.to_numpy(), 'Blues')],
+                '🛏️ Distribution des Chambres',
+                xaxis={'title': {'text': 'bedrooms'}},
+                yaxis={'title': {'text': 'count'}}
             )
-            
-            fig.update_layout(template='plotly_white', height=400)
-            return fig
         except:
             return go.Figure()
     
@@ -743,6 +1156,42 @@ class DashboardUltimate:
         except:
             return "0"
     
+    def create_trend_indicator(self, trend):
+        """Indicateur de trend (flèche + pourcentage) d'une carte KPI"""
+        if trend is None:
+            return html.Div(style={'height': '20px'})
+        
+        # Déterminer couleur et icône du trend
+        colors = self.COLORS
+        if trend > 0:
+            trend_color = colors['success']
+            trend_icon = 'fa-arrow-up'
+            trend_text = f"+{abs(trend):.1f}%"
+        elif trend < 0:
+            trend_color = colors['danger']
+            trend_icon = 'fa-arrow-down'
+            trend_text = f"-{abs(trend):.1f}%"
+        else:
+            trend_color = colors['text_secondary']
+            trend_icon = 'fa-minus'
+            trend_text = "Stable"
+        
+        return html.Div([
+            html.I(className=f"fas {trend_icon}", style={
+                'fontSize': '0.75rem',
+                'color': trend_color,
+                'marginRight': '0.4rem'
+            }),
+            html.Span(trend_text, style={
+                'fontSize': '0.85rem',
+                'color': trend_color,
+                'fontWeight': '700'
+            })
+        ], style={
+            'display': 'flex',
+            'alignItems': 'center'
+        })
+    
     def create_kpi_card(self, icon, title, value, color, suffix="", trend=None, is_percentage=False):
         """Carte KPI moderne et cohérente avec le thème"""
         
@@ -752,21 +1201,6 @@ class DashboardUltimate:
         else:
             display_value = f"{self.format_number(value)}{suffix}"
         
-        # Déterminer couleur et icône du trend
-        if trend is not None:
-            if trend > 0:
-                trend_color = self.COLORS['success']
-                trend_icon = 'fa-arrow-up'
-                trend_text = f"+{abs(trend):.1f}%"
-            elif trend < 0:
-                trend_color = self.COLORS['danger']
-                trend_icon = 'fa-arrow-down'
-                trend_text = f"-{abs(trend):.1f}%"
-            else:
-                trend_color = self.COLORS['text_secondary']
-                trend_icon = 'fa-minus'
-                trend_text = "Stable"
-        
         return dbc.Card([
             dbc.CardBody([
                 # Icon + Title Row
@@ -776,102 +1210,73 @@ class DashboardUltimate:
                             'fontSize': '2rem',
                             'color': color,
                         })
-                    ], style={
-                        'width': '50px',
-                        'height': '50px',
-                        'borderRadius': '12px',
-                        'background': f'{color}15',
-                        'display': 'flex',
-                        'alignItems': 'center',
-                        'justifyContent': 'center',
-                        'marginBottom': '1rem'
-                    }),
-                    html.H6(title, style={
-                        'fontSize': '0.8rem',
-                        'fontWeight': '600',
-                        'color': self.COLORS['text_secondary'],
-                        'textTransform': 'uppercase',
-                        'letterSpacing': '0.5px',
-                        'marginBottom': '0.8rem'
-                    })
+                    ], style={**self.KPI_ICON_BOX_STYLE, 'background': f'{color}15'}),
+                    html.H6(title, style=self.KPI_TITLE_STYLE)
                 ]),
                 
-                # Value
-                html.H3(display_value, style={
-                    'fontWeight': '800',
-                    'color': self.COLORS['text_primary'],
-                    'fontSize': '1.8rem',
-                    'marginBottom': '0.8rem',
-                    'letterSpacing': '-0.5px'
-                }),
+                # Value (mise à jour seule par le callback)
+                html.H3(display_value, id={'type': 'kpi-value', 'index': title}, style=self.KPI_VALUE_STYLE),
                 
-                # Trend Indicator
-                html.Div([
-                    html.I(className=f"fas {trend_icon}", style={
-                        'fontSize': '0.75rem',
-                        'color': trend_color,
-                        'marginRight': '0.4rem'
-                    }),
-                    html.Span(trend_text, style={
-                        'fontSize': '0.85rem',
-                        'color': trend_color,
-                        'fontWeight': '700'
-                    })
-                ], style={
-                    'display': 'flex',
-                    'alignItems': 'center'
-                }) if trend is not None else html.Div(style={'height': '20px'})
+                # Trend Indicator (mis à jour seul par le callback)
+                html.Div(self.create_trend_indicator(trend), id={'type': 'kpi-trend', 'index': title})
                 
             ], style={'padding': '1.5rem'})
-        ], className='h-100 kpi-card', style={
-            'borderRadius': '16px',
-            'border': 'none',
-            'boxShadow': '0 2px 12px rgba(0,0,0,0.08)',
-            'transition': 'all 0.3s cubic-bezier(0.4, 0, 0.2, 1)',
-            'borderLeft': f'4px solid {color}',
-            'background': 'white'
-        }, id={'type': 'kpi-card', 'index': title})
+        ], className='h-100 kpi-card', style={**self.KPI_CARD_STYLE, 'borderLeft': f'4px solid {color}'},
+           id={'type': 'kpi-card', 'index': title})
+    
+    def kpi_trend(self, kpis, trend_key, factor):
+        """Trend d'une carte, None si la carte n'en affiche pas"""
+        return kpis.get(trend_key, 0) * factor if trend_key else None
+    
+    def build_kpi_cards(self, kpis):
+        """Ligne des 6 cartes KPI"""
+        return dbc.Row([
+            dbc.Col([
+                self.create_kpi_card(
+                    icon,
+                    title,
+                    kpis[key],
+                    self.COLORS[color],
+                    suffix,
+                    trend=self.kpi_trend(kpis, trend_key, factor)
+                )
+            ], md=2)
+            for icon, title, key, color, suffix, trend_key, factor in self.KPI_CARDS
+        ], className='g-3')
+    
+    def kpi_data(self, kpis):
+        """Valeurs brutes des 6 cartes (ordre du layout) : le formatage est fait côté navigateur"""
+        return [
+            {
+                'value': float(kpis[key]),
+                'suffix': suffix,
+                'trend': self.kpi_trend(kpis, trend_key, factor)
+            }
+            for _, _, key, _, suffix, trend_key, factor in self.KPI_CARDS
+        ]
     
     # ==================== LAYOUT ====================
     
+    def graph_card(self, title, graph_id):
+        """Carte standard contenant un graphique"""
+        return dbc.Card([
+            dbc.CardHeader(title, style=self.CARD_HEADER_STYLE),
+            dbc.CardBody([dcc.Loading(dcc.Graph(id=graph_id, figure=self.BASE_FIGURE))])
+        ], className='shadow-sm mb-4', style=self.CARD_STYLE)
+    
     def setup_layout(self):
         """Layout ultime avec tous les composants"""
         
         self.app.layout = dbc.Container([
             # CSS personnalisé injecté via html.Link avec data URI
-            html.Link(
-                rel='stylesheet',
-                href='data:text/css;base64,' + __import__('base64').b64encode("""
-                    .kpi-card:hover {
-                        transform: translateY(-5px) !important;
-                        box-shadow: 0 8px 24px rgba(0,0,0,0.15) !important;
-                    }
-                    
-                    .kpi-card {
-                        cursor: pointer;
-                    }
-                    
-                    ::-webkit-scrollbar {
-                        width: 10px;
-                        height: 10px;
-                    }
-                    
-                    ::-webkit-scrollbar-track {
-                        background: #F1F5F9;
-                    }
-                    
-                    ::-webkit-scrollbar-thumb {
-                        background: #CBD5E1;
-                        border-radius: 5px;
-                    }
-                    
-                    ::-webkit-scrollbar-thumb:hover {
-                        background: #94A3B8;
-                    }
-                """.encode()).decode()
-            ),
+            html.Link(rel='stylesheet', href=self.CUSTOM_CSS_HREF),
             
-            dcc.Store(id='data-store', data=[]),
+            # Stores au format colonnes {colonne: [valeurs]} (clés non répétées par ligne)
+            dcc.Store(id='filtered-store', data={}),
+            dcc.Store(id='data-version'),
+            dcc.Store(id='rendered-key'),
+            dcc.Store(id='kpi-data'),
+            dcc.Store(id='kpi-colors', data=self.COLORS),
             
             # Header uniforme avec gradient
             html.Div([
@@ -879,33 +1284,14 @@ class DashboardUltimate:
                     dbc.Row([
                         dbc.Col([
                             html.Div([
-                                html.H1("📊 Dashboard ImmoAnalytics", className='mb-2', style={
-                                    'fontWeight': '800',
-                                    'color': 'white',
-                                    'fontSize': '2.2rem',
-                                    'textShadow': '0 2px 10px rgba(0,0,0,0.2)',
-                                    'marginBottom': '0.5rem'
-                                }),
+                                html.H1("📊 Dashboard ImmoAnalytics", className='mb-2', style=self.HEADER_TITLE_STYLE),
                                 html.P("Analyse complète et détaillée du marché immobilier sénégalais", 
-                                       style={
-                                           'fontSize': '1rem',
-                                           'color': 'rgba(255,255,255,0.95)',
-                                           'marginBottom': '0'
-                                       })
+                                       style=self.HEADER_SUBTITLE_STYLE)
                             ])
                         ], width=12)
                     ])
                 ], fluid=False)
-            ], style={
-                'background': f'linear-gradient(135deg, {self.COLORS["primary"]}, {self.COLORS["secondary"]})',
-                'padding': '2.5rem 0',
-                'marginBottom': '2rem',
-                'borderRadius': '0 0 25px 25px',
-                'boxShadow': '0 10px 40px rgba(102, 126, 234, 0.3)',
-                'marginLeft': '-12px',
-                'marginRight': '-12px',
-                'marginTop': '-12px'
-            }),
+            ], style=self.HEADER_STYLE),
             
             # Filtres
             dbc.Card([
@@ -915,14 +1301,7 @@ class DashboardUltimate:
                             html.Label("🏠 Type de Propriété", className='fw-bold mb-2'),
                             dcc.Dropdown(
                                 id='filter-property-type',
-                                options=[
-                                    {'label': 'Tous', 'value': 'Tous'},
-                                    {'label': 'Appartement', 'value': 'Appartement'},
-                                    {'label': 'Maison', 'value': 'Maison'},
-                                    {'label': 'Villa', 'value': 'Villa'},
-                                    {'label': 'Terrain', 'value': 'Terrain'},
-                                    {'label': 'Studio', 'value': 'Studio'}
-                                ],
+                                options=[{'label': ptype, 'value': ptype} for ptype in self.PROPERTY_TYPES],
                                 value='Tous',
                                 className='mb-3'
                             )
@@ -961,84 +1340,120 @@ class DashboardUltimate:
                         ], md=3)
                     ])
                 ])
-            ], className='mb-4 shadow-sm', style={'borderRadius': '15px'}),
+            ], className='mb-4 shadow-sm', style=self.CARD_STYLE),
             
             # KPIs
             dbc.Row([
-                dbc.Col([html.Div(id='kpi-cards')])
+                # Cartes rendues une fois : le callback ne réécrit que valeurs et trends
+                dbc.Col([html.Div(self.build_kpi_cards(self.calculate_kpis(pd.DataFrame())), id='kpi-cards')])
             ], className='mb-4'),
             
             # Graphiques - Ligne 1
             dbc.Row([
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("💰 Distribution des Prix", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='price-distribution'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("💰 Distribution des Prix", 'price-distribution')
                 ], md=6),
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("🏙️ Top 10 Villes", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='city-comparison'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("🏙️ Top 10 Villes", 'city-comparison')
                 ], md=6)
             ]),
             
             # Graphiques - Ligne 2
             dbc.Row([
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("🔄 Vente vs Location", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='status-pie'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("🔄 Vente vs Location", 'status-pie')
                 ], md=4),
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("🏠 Types de Propriétés", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='property-types'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("🏠 Types de Propriétés", 'property-types')
                 ], md=4),
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("🛏️ Distribution Chambres", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='bedroom-distribution'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("🛏️ Distribution Chambres", 'bedroom-distribution')
                 ], md=4)
             ]),
             
             # Graphiques - Ligne 3
             dbc.Row([
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("📊 Comparaison Sources", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='source-comparison'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("📊 Comparaison Sources", 'source-comparison')
                 ], md=6),
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("📐 Prix au m² par Type", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='price-per-m2'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("📐 Prix au m² par Type", 'price-per-m2')
                 ], md=6)
             ]),
             
             # Graphiques - Ligne 4
             dbc.Row([
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("📊 Relation Prix - Surface", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='scatter-price-surface'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("📊 Relation Prix - Surface", 'scatter-price-surface')
                 ], md=6),
                 dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader("🌅 Structure du Marché", style={'fontWeight': '700', 'fontSize': '1.1rem'}),
-                        dbc.CardBody([dcc.Loading(dcc.Graph(id='sunburst-market'))])
-                    ], className='shadow-sm mb-4', style={'borderRadius': '15px'})
+                    self.graph_card("🌅 Structure du Marché", 'sunburst-market')
                 ], md=6)
             ])
             
-        ], fluid=True, className='p-4', style={'background': self.COLORS['bg_light'], 'minHeight': '100vh'})
+        ], fluid=True, className='p-4', style=self.CONTAINER_STYLE)
+    
+    def build_dashboard_outputs(self, data):
+        """Données KPI + 7 figures (dicts prêts à sérialiser) depuis les colonnes du store"""
+        # Le DataFrame est reconstruit une fois pour KPIs + graphiques
+        try:
+            df = self.frame_from_store(data)
+        except Exception:
+            df = pd.DataFrame()
+        
+        # Agrégats calculés une fois, partagés par les KPIs et les graphiques
+        try:
+            aggs = self.compute_aggregates(df) if not df.empty else None
+        except Exception:
+            aggs = None
+        
+        try:
+            kpi_data = self.kpi_data(self.calculate_kpis(df, aggs))
+        except Exception as e:
+            logger.exception("❌ Erreur KPIs: %s", e)
+            kpi_data = [{'value': None, 'suffix': '', 'trend': None}] * len(self.KPI_CARDS)
+        
+        try:
+            figures = self.build_all_figures(df, aggs)
+        except:
+            figures = (go.Figure(),) * 7
+        
+        return (kpi_data, *(fig if isinstance(fig, dict) else fig.to_dict() for fig in figures))
+    
+    def figure_patch(self, figure):
+        """Patch partiel : traces + mise en page propre au graphique, le template reste côté navigateur"""
+        layout = {k: v for k, v in figure.get('layout', {}).items() if k != 'template'}
+        if not figure.get('data') and not layout:
+            # Figure vide (erreur / aucune donnée) : on repart de la base
+            return self.BASE_FIGURE
+        
+        patch = Patch()
+        patch['data'] = figure.get('data', [])
+        for key, value in layout.items():
+            patch['layout'][key] = value
+        return patch
+    
+    def get_dashboard_outputs(self, data, version, property_type):
+        """Sorties du dashboard mémoïsées par (version des données, type de propriété)"""
+        key = (version, property_type)
+        outputs = None
+        if version is not None:
+            with self._figure_cache_lock:
+                outputs = self._figure_cache.get(key)
+                if outputs is not None:
+                    self._figure_cache.move_to_end(key)
+        
+        if outputs is None:
+            # Construction hors verrou (coûteuse) ; seule l'insertion LRU est protégée
+            outputs = self.build_dashboard_outputs(data)
+            if version is not None:
+                with self._figure_cache_lock:
+                    self._figure_cache[key] = outputs
+                    while len(self._figure_cache) > self.FIGURE_CACHE_SIZE:
+                        self._figure_cache.popitem(last=False)
+        
+        kpi_data, *figures = outputs
+        return (kpi_data, *(self.figure_patch(fig) for fig in figures))
     
     # ==================== CALLBACKS ====================
     
@@ -1046,130 +1461,167 @@ class DashboardUltimate:
         """Callbacks complets"""
         
         @callback(
-            [Output('data-store', 'data'),
+            [Output('filtered-store', 'data'),
+             Output('data-version', 'data'),
              Output('filter-city', 'options')],
             [Input('refresh-btn', 'n_clicks'),
-             Input('filter-property-type', 'value'),
              Input('filter-city', 'value'),
-             Input('filter-status', 'value')],
+             Input('filter-status', 'value'),
+             Input('filter-property-type', 'value')],
             prevent_initial_call=False
         )
-        def update_data(n_clicks, prop_type, city, status):
+        def update_data(n_clicks, city, status, property_type):
+            # Type filtré en SQL avant le LIMIT par source : jusqu'à 1000 annonces du type choisi
+            # (un filtrage client sur l'échantillon 'Tous' n'en garderait que quelques-unes)
+            # Chaque chargement en base porte une nouvelle version (clé du cache de figures)
+            version = datetime.now().isoformat()
             try:
-                df = self.safe_get_data(
-                    property_type=prop_type,
+                df, version = self.cached_data(
+                    property_type=property_type or 'Tous',
                     city=city,
                     status_filter=status,
-                    limit=1000
+                    limit=1000,
+                    refresh=ctx.triggered_id == 'refresh-btn'
                 )
                 
-                cities = self.get_available_cities()
+                cities = self.get_available_cities(refresh=ctx.triggered_id == 'refresh-btn')
                 city_options = [{'label': c, 'value': c} for c in cities]
                 
-                return df.to_dict('records'), city_options
+                return df.to_dict('list'), version, city_options
             except:
-                return [], [{'label': 'Toutes', 'value': 'Toutes'}]
+                return {}, version, [{'label': 'Toutes', 'value': 'Toutes'}]
         
-        @callback(
-            Output('kpi-cards', 'children'),
-            Input('data-store', 'data')
+        # Cartes KPI : formatage des valeurs et des trends dans le navigateur
+        clientside_callback(
+            """
+            function(cards, colors) {
+                if (!cards) {
+                    return [dash_clientside.no_update, dash_clientside.no_update];
+                }
+                function formatNumber(num) {
+                    if (num >= 1000000) { return (num / 1000000).toFixed(1) + 'M'; }
+                    if (num >= 1000) { return (num / 1000).toFixed(1) + 'K'; }
+                    return String(Math.trunc(num));
+                }
+                function html(type, props) {
+                    return {namespace: 'dash_html_components', type: type, props: props};
+                }
+                var values = cards.map(function(c) {
+                    return c.value === null ? '—' : formatNumber(c.value) + c.suffix;
+                });
+                var trends = cards.map(function(c) {
+                    if (c.trend === null) {
+                        return html('Div', {style: {height: '20px'}});
+                    }
+                    var color = colors.text_secondary, icon = 'fa-minus', text = 'Stable';
+                    if (c.trend > 0) {
+                        color = colors.success; icon = 'fa-arrow-up'; text = '+' + Math.abs(c.trend).toFixed(1) + '%';
+                    } else if (c.trend < 0) {
+                        color = colors.danger; icon = 'fa-arrow-down'; text = '-' + Math.abs(c.trend).toFixed(1) + '%';
+                    }
+                    return html('Div', {
+                        style: {display: 'flex', alignItems: 'center'},
+                        children: [
+                            html('I', {className: 'fas ' + icon, style: {fontSize: '0.75rem', color: color, marginRight: '0.4rem'}}),
+                            html('Span', {children: text, style: {fontSize: '0.85rem', color: color, fontWeight: '700'}})
+                        ]
+                    });
+                });
+                return [values, trends];
+            }
+            """,
+            [Output({'type': 'kpi-value', 'index': ALL}, 'children'),
+             Output({'type': 'kpi-trend', 'index': ALL}, 'children')],
+            Input('kpi-data', 'data'),
+            State('kpi-colors', 'data')
         )
-        def update_kpis(data):
-            try:
-                df = pd.DataFrame(data).copy()
-                kpis = self.calculate_kpis(df)
+        
+        # Camembert statut et types : simples comptages, construits dans le navigateur
+        # depuis filtered-store (aucune figure sérialisée côté serveur pour ces deux graphiques)
+        clientside_callback(
+            """
+            function(columns, colors, pieFigure, typesFigure) {
+                function base(current, data, title, extra) {
+                    var layout = {
+                        template: current && current.layout ? current.layout.template : undefined,
+                        title: {text: title},
+                        height: 400
+                    };
+                    Object.keys(extra || {}).forEach(function(k) { layout[k] = extra[k]; });
+                    return {data: data, layout: layout};
+                }
+                function countBy(values) {
+                    var counts = {};
+                    (values || []).forEach(function(v) {
+                        if (v !== null && v !== undefined) { counts[v] = (counts[v] || 0) + 1; }
+                    });
+                    return counts;
+                }
+                if (!columns || !columns.price || !columns.price.length) {
+                    return [base(pieFigure, [], ''), base(typesFigure, [], '')];
+                }
                 
-                return dbc.Row([
-                    dbc.Col([
-                        self.create_kpi_card(
-                            'fa-home', 
-                            'Total Propriétés', 
-                            kpis['total'], 
-                            self.COLORS['primary'], 
-                            trend=kpis.get('total_trend', 0)
-                        )
-                    ], md=2),
-                    dbc.Col([
-                        self.create_kpi_card(
-                            'fa-money-bill-wave', 
-                            'Prix Moyen', 
-                            kpis['avg_price'], 
-                            self.COLORS['success'], 
-                            ' FCFA', 
-                            trend=kpis.get('price_trend', 0)
-                        )
-                    ], md=2),
-                    dbc.Col([
-                        self.create_kpi_card(
-                            'fa-chart-line', 
-                            'Prix Médian', 
-                            kpis['median_price'], 
-                            self.COLORS['info'], 
-                            ' FCFA'
-                        )
-                    ], md=2),
-                    dbc.Col([
-                        self.create_kpi_card(
-                            'fa-ruler-combined', 
-                            'Prix/m²', 
-                            kpis['avg_m2'], 
-                            self.COLORS['warning'], 
-                            ' FCFA',
-                            trend=kpis.get('price_trend', 0) * 0.8  # Légèrement inférieur au prix moyen
-                        )
-                    ], md=2),
-                    dbc.Col([
-                        self.create_kpi_card(
-                            'fa-tag', 
-                            'Ventes', 
-                            kpis['vente'], 
-                            self.COLORS['purple']
-                        )
-                    ], md=2),
-                    dbc.Col([
-                        self.create_kpi_card(
-                            'fa-key', 
-                            'Locations', 
-                            kpis['location'], 
-                            self.COLORS['danger']
-                        )
-                    ], md=2)
-                ], className='g-3')
-            except Exception as e:
-                print(f"❌ Erreur KPIs: {e}")
-                traceback.print_exc()
-                return html.Div("Erreur chargement KPIs", className='alert alert-danger')
+                var status = countBy(columns.status);
+                var statusNames = Object.keys(status);
+                var statusColors = {Vente: colors.primary, Location: colors.success};
+                var pie = base(pieFigure, [{
+                    type: 'pie',
+                    labels: statusNames,
+                    values: statusNames.map(function(s) { return status[s]; }),
+                    marker: {colors: statusNames.map(function(s) { return statusColors[s] || colors.info; })},
+                    hole: 0.4
+                }], '🔄 Vente vs Location');
+                
+                var types = countBy(columns.property_type);
+                var top = Object.keys(types)
+                    .sort(function(a, b) { return types[b] - types[a]; })
+                    .slice(0, 8);
+                var counts = top.map(function(t) { return types[t]; });
+                var bar = base(typesFigure, [{
+                    type: 'bar',
+                    x: top,
+                    y: counts,
+                    marker: {color: counts, colorscale: 'Viridis', showscale: true,
+                             colorbar: {title: {text: 'count'}}}
+                }], '🏠 Types de Propriétés', {
+                    xaxis: {title: {text: 'Type'}},
+                    yaxis: {title: {text: 'Nombre'}}
+                });
+                
+                return [pie, bar];
+            }
+            """,
+            [Output('status-pie', 'figure'),
+             Output('property-types', 'figure')],
+            Input('filtered-store', 'data'),
+            [State('kpi-colors', 'data'),
+             State('status-pie', 'figure'),
+             State('property-types', 'figure')]
+        )
         
         @callback(
-            [Output('price-distribution', 'figure'),
+            [Output('kpi-data', 'data'),
+             Output('price-distribution', 'figure'),
              Output('city-comparison', 'figure'),
-             Output('status-pie', 'figure'),
-             Output('property-types', 'figure'),
              Output('bedroom-distribution', 'figure'),
              Output('source-comparison', 'figure'),
              Output('price-per-m2', 'figure'),
              Output('scatter-price-surface', 'figure'),
-             Output('sunburst-market', 'figure')],
-            Input('data-store', 'data')
+             Output('sunburst-market', 'figure'),
+             Output('rendered-key', 'data')],
+            Input('filtered-store', 'data'),
+            [State('data-version', 'data'),
+             State('filter-property-type', 'value'),
+             State('rendered-key', 'data')]
         )
-        def update_all_graphs(data):
-            try:
-                df = pd.DataFrame(data).copy()
-                
-                return (
-                    self.create_price_distribution(df),
-                    self.create_city_comparison(df),
-                    self.create_status_pie(df),
-                    self.create_property_types(df),
-                    self.create_bedroom_distribution(df),
-                    self.create_source_comparison(df),
-                    self.create_price_per_m2_chart(df),
-                    self.create_scatter_price_surface(df),
-                    self.create_sunburst_market(df)
-                )
-            except:
-                empty = go.Figure()
-                return empty, empty, empty, empty, empty, empty, empty, empty, empty
+        def update_dashboard(data, version, property_type, rendered_key):
+            # Même version de données et même type que l'affichage courant : rien à faire
+            key = [version, property_type or 'Tous']
+            if key == rendered_key:
+                raise PreventUpdate
+            
+            # Retour sur un type déjà affiché : KPIs et figures servis depuis le cache
+            return (*self.get_dashboard_outputs(data, version, key[1]), key)
 
 
 # ✅ Factory function
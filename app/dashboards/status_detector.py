@@ -7,6 +7,9 @@ Auteur: Cos - ENSAE Dakar
 import re
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -291,6 +294,108 @@ class StatusDetector:
                 return 'Vente'
             else:
                 return 'Location'
+    
+    @classmethod
+    def clean_text_series(cls, values):
+        """Équivalent de clean_text sur une Series entière (valeurs non texte -> chaîne vide)"""
+        text = pd.Series(values, dtype=object)
+        text = text.where(text.map(lambda v: isinstance(v, str)), '').astype(str)
+        
+        accents = str.maketrans({
+            'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
+            'à': 'a', 'â': 'a', 'ä': 'a',
+            'ù': 'u', 'û': 'u', 'ü': 'u',
+            'ô': 'o', 'ö': 'o',
+            'î': 'i', 'ï': 'i',
+            'ç': 'c'
+        })
+        return (
+            text.str.lower()
+            .str.translate(accents)
+            .str.replace(r'[^\w\s/\-]', ' ', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip()
+        )
+    
+    @classmethod
+    def search_patterns_series(cls, cleaned, patterns_dict, weights):
+        """Score pondéré de search_patterns pour toute une Series déjà nettoyée"""
+        score = np.zeros(len(cleaned))
+        for category, patterns in patterns_dict.items():
+            # Une alternance par catégorie : même règle « un match par catégorie suffit »
+            matched = cleaned.str.contains('|'.join(f'(?:{p})' for p in patterns), case=False, regex=True)
+            score += matched.to_numpy(dtype=bool) * weights.get(category, 1)
+        return score
+    
+    @classmethod
+    def detect_status_vectorized(cls, titles=None, prices=None, property_types=None, sources=None, native_statuses=None):
+        """
+        Version vectorisée de detect_status : mêmes règles et même ordre de priorité,
+        appliqués à des colonnes entières (un passage regex par catégorie, plus un appel par annonce)
+        
+        Returns:
+            np.ndarray: 'Vente' ou 'Location' pour chaque annonce
+        """
+        raw_price = pd.Series(prices, dtype=object)
+        price = pd.to_numeric(raw_price, errors='coerce').to_numpy(dtype=np.float64)
+        missing_price = raw_price.map(lambda v: v is None).to_numpy(dtype=bool)
+        n = len(price)
+        
+        def column(values):
+            return pd.Series([None] * n if values is None else list(values), dtype=object)
+        
+        weights = {
+            'explicit': 10, 'temporal': 8, 'transaction': 7, 'legal': 7,
+            'context': 5, 'property_types': 3, 'investment': 2
+        }
+        
+        # 2. Titre
+        titles_clean = cls.clean_text_series(column(titles))
+        score_location = cls.search_patterns_series(titles_clean, cls.LOCATION_PATTERNS, weights)
+        score_vente = cls.search_patterns_series(titles_clean, cls.VENTE_PATTERNS, weights)
+        
+        # 3. Type de bien (terrain -> Vente forcé ; chambre compté ici puis à nouveau avec le prix)
+        types_clean = cls.clean_text_series(column(property_types))
+        is_land = types_clean.str.contains('terrain|parcelle|lot|plot|land', regex=True).to_numpy(dtype=bool)
+        is_room = types_clean.str.contains('chambre|room', regex=True).to_numpy(dtype=bool)
+        score_location += is_room * 3
+        
+        # 4. Prix (None : pas de score ; NaN : comme `detect_from_price`, tombe dans la dernière tranche)
+        with np.errstate(invalid='ignore'):
+            priced = ~(missing_price | (price == 0) | (price < 0))
+            price_location = np.select([price < 500_000, price < 1_500_000, price < 5_000_000], [8, 6, 1], 0)
+            price_vente = np.select(
+                [price < 1_500_000, price < 5_000_000, price < 20_000_000, price < 50_000_000], [0, 2, 4, 6], 8
+            )
+        score_location += np.where(priced, price_location + is_room * 3, 0)
+        score_vente += np.where(priced, price_vente, 0)
+        
+        # 5. Source
+        source = column(sources)
+        score_location += (source == 'LogerDakar').to_numpy(dtype=bool) * 1
+        score_vente += source.isin(['CoinAfrique', 'ExpatDakar']).to_numpy(dtype=bool) * 0.5
+        
+        # Décision finale (égalité : seuil de prix 1.5M)
+        with np.errstate(invalid='ignore'):
+            tie_vente = price >= 1_500_000
+        status = np.where(
+            score_location > score_vente, 'Location',
+            np.where(score_vente > score_location, 'Vente', np.where(tie_vente, 'Vente', 'Location'))
+        ).astype(object)
+        status[is_land] = 'Vente'
+        
+        # 1. Statut natif : prioritaire sur tout le reste
+        native = cls.clean_native_series(column(native_statuses))
+        status[native.isin(['vente', 'sale', 'sell', 'à vendre', 'a vendre']).to_numpy(dtype=bool)] = 'Vente'
+        status[native.isin(['location', 'rent', 'rental', 'à louer', 'a louer']).to_numpy(dtype=bool)] = 'Location'
+        
+        return status
+    
+    @staticmethod
+    def clean_native_series(values):
+        """Statuts natifs normalisés comme dans detect_status (texte seulement)"""
+        is_text = values.map(lambda v: isinstance(v, str))
+        return values.where(is_text, '').astype(str).str.lower().str.strip()
 
 
 # Fonction helper pour utilisation rapide
@@ -315,6 +420,25 @@ def detect_listing_status(title=None, price=None, property_type=None, source=Non
     )
 
 
+def detect_listing_status_vectorized(titles=None, prices=None, property_types=None, sources=None, native_statuses=None):
+    """
+    Détection du statut pour des colonnes entières (mêmes résultats que detect_listing_status ligne à ligne)
+    
+    Usage:
+        df['status'] = detect_listing_status_vectorized(
+            titles=df['title'], prices=df['price'],
+            property_types=df['property_type'], sources=df['source']
+        )
+    """
+    return StatusDetector.detect_status_vectorized(
+        titles=titles,
+        prices=prices,
+        property_types=property_types,
+        sources=sources,
+        native_statuses=native_statuses
+    )
+
+
 # Tests unitaires
 if __name__ == "__main__":
     # Configuration du logging pour les tests
@@ -275,6 +275,76 @@ class ViewerDashboard:
         'border': '#E2E8F0'
     }
     
+    # Styles des cartes de résultats (jusqu'à 50 cartes par recherche) : construits une fois, partagés
+    RESULT_ICON_STYLE = {'opacity': '0.3'}
+    FAVORITE_BTN_BASE_STYLE = {
+        'position': 'absolute',
+        'top': '12px',
+        'right': '12px',
+        'borderRadius': '50%',
+        'padding': '8px',
+        'cursor': 'pointer',
+        'boxShadow': '0 2px 8px rgba(0,0,0,0.15)'
+    }
+    FAVORITE_BTN_STYLE = {**FAVORITE_BTN_BASE_STYLE, 'background': 'rgba(255,255,255,0.9)'}
+    FAVORITE_BTN_ACTIVE_STYLE = {**FAVORITE_BTN_BASE_STYLE, 'background': 'white'}
+    RESULT_IMAGE_STYLE = {
+        'height': '160px',
+        'background': f'linear-gradient(135deg, {COLORS["bg_main"]}, {COLORS["border"]})',
+        'borderRadius': '12px 12px 0 0',
+        'display': 'flex',
+        'alignItems': 'center',
+        'justifyContent': 'center',
+        'position': 'relative'
+    }
+    STATUS_BADGE_BASE_STYLE = {
+        'color': 'white',
+        'padding': '4px 12px',
+        'borderRadius': '6px',
+        'fontSize': '11px',
+        'fontWeight': '600'
+    }
+    STATUS_BADGE_VENTE_STYLE = {**STATUS_BADGE_BASE_STYLE, 'background': COLORS['success']}
+    STATUS_BADGE_LOCATION_STYLE = {**STATUS_BADGE_BASE_STYLE, 'background': COLORS['info']}
+    SOURCE_BADGE_STYLE = {
+        'background': COLORS['bg_main'],
+        'color': COLORS['text_secondary'],
+        'padding': '4px 10px',
+        'borderRadius': '6px',
+        'fontSize': '10px',
+        'fontWeight': '600',
+        'marginLeft': '8px'
+    }
+    BADGE_ROW_STYLE = {'marginBottom': '12px', 'display': 'flex'}
+    RESULT_TITLE_STYLE = {
+        'fontSize': '15px',
+        'fontWeight': '600',
+        'color': COLORS['text_primary'],
+        'marginBottom': '8px',
+        'lineHeight': '1.4',
+        'height': '42px',
+        'overflow': 'hidden'
+    }
+    RESULT_CITY_STYLE = {'fontSize': '13px', 'color': COLORS['text_secondary'], 'marginLeft': '4px'}
+    RESULT_CITY_ROW_STYLE = {'marginBottom': '12px'}
+    SPEC_TEXT_STYLE = {'fontSize': '12px', 'marginLeft': '4px'}
+    SPEC_ITEM_STYLE = {'marginRight': '12px'}
+    SPECS_ROW_STYLE = {
+        'display': 'flex',
+        'marginBottom': '16px',
+        'paddingBottom': '16px',
+        'borderBottom': f'1px solid {COLORS["border"]}'
+    }
+    RESULT_PRICE_STYLE = {'fontSize': '22px', 'fontWeight': '800', 'color': COLORS['primary']}
+    RESULT_PRICE_UNIT_STYLE = {'fontSize': '13px', 'color': COLORS['text_secondary'], 'marginLeft': '4px'}
+    RESULT_BODY_STYLE = {'padding': '16px'}
+    RESULT_CARD_STYLE = {
+        'background': 'white',
+        'borderRadius': '16px',
+        'boxShadow': '0 2px 8px rgba(0,0,0,0.08)',
+        'overflow': 'hidden'
+    }
+    
     def __init__(self, server=None, routes_pathname_prefix="/viewer/", requests_pathname_prefix="/viewer/"):
         
         # CSS personnalisé
@@ -355,6 +425,8 @@ class ViewerDashboard:
             routes_pathname_prefix=routes_pathname_prefix,
             requests_pathname_prefix=requests_pathname_prefix,
             suppress_callback_exceptions=True,
+            # Pas de "Updating..." dans l'onglet à chaque callback
+            update_title=None,
             meta_tags=[{
                 "name": "viewport",
                 "content": "width=device-width, initial-scale=1"
@@ -1031,10 +1103,12 @@ class ViewerDashboard:
                     'boxShadow': '0 2px 8px rgba(0,0,0,0.06)'
                 })
             
-            df = pd.DataFrame(results)
+            # Seules les colonnes utiles au résumé ; statut en `category` (comptage sur codes entiers)
+            df = pd.DataFrame(results, columns=['status', 'price']).astype({'status': 'category'})
             
-            vente_count = len(df[df['status'] == 'Vente'])
-            location_count = len(df[df['status'] == 'Location'])
+            status_counts = df['status'].value_counts()
+            vente_count = int(status_counts.get('Vente', 0))
+            location_count = int(status_counts.get('Location', 0))
             
             return html.Div([
                 html.Div([
@@ -1116,7 +1190,7 @@ class ViewerDashboard:
                             icon="mdi:home-city" if prop['property_type'] == 'Appartement' else "mdi:home",
                             width=60,
                             color=self.COLORS['primary'],
-                            style={'opacity': '0.3'}
+                            style=self.RESULT_ICON_STYLE
                         ),
                         html.Div([
                             DashIconify(
@@ -1124,115 +1198,47 @@ class ViewerDashboard:
                                 width=24,
                                 color=self.COLORS['danger'] if is_favorite else 'white'
                             )
-                        ], id={'type': 'favorite-btn', 'index': prop['id']}, className='favorite-heart', style={
-                            'position': 'absolute',
-                            'top': '12px',
-                            'right': '12px',
-                            'background': 'rgba(255,255,255,0.9)' if not is_favorite else 'white',
-                            'borderRadius': '50%',
-                            'padding': '8px',
-                            'cursor': 'pointer',
-                            'boxShadow': '0 2px 8px rgba(0,0,0,0.15)'
-                        })
-                    ], style={
-                        'height': '160px',
-                        'background': f'linear-gradient(135deg, {self.COLORS["bg_main"]}, {self.COLORS["border"]})',
-                        'borderRadius': '12px 12px 0 0',
-                        'display': 'flex',
-                        'alignItems': 'center',
-                        'justifyContent': 'center',
-                        'position': 'relative'
-                    }),
+                        ], id={'type': 'favorite-btn', 'index': prop['id']}, className='favorite-heart',
+                           style=self.FAVORITE_BTN_ACTIVE_STYLE if is_favorite else self.FAVORITE_BTN_STYLE)
+                    ], style=self.RESULT_IMAGE_STYLE),
                     
                     # Info
                     html.Div([
                         html.Div([
-                            html.Span(prop['status'], style={
-                                'background': self.COLORS['success'] if prop['status'] == 'Vente' else self.COLORS['info'],
-                                'color': 'white',
-                                'padding': '4px 12px',
-                                'borderRadius': '6px',
-                                'fontSize': '11px',
-                                'fontWeight': '600'
-                            }),
-                            html.Span(prop['source'], style={
-                                'background': self.COLORS['bg_main'],
-                                'color': self.COLORS['text_secondary'],
-                                'padding': '4px 10px',
-                                'borderRadius': '6px',
-                                'fontSize': '10px',
-                                'fontWeight': '600',
-                                'marginLeft': '8px'
-                            })
-                        ], style={'marginBottom': '12px', 'display': 'flex'}),
+                            html.Span(prop['status'], style=(
+                                self.STATUS_BADGE_VENTE_STYLE if prop['status'] == 'Vente' else self.STATUS_BADGE_LOCATION_STYLE
+                            )),
+                            html.Span(prop['source'], style=self.SOURCE_BADGE_STYLE)
+                        ], style=self.BADGE_ROW_STYLE),
                         
-                        html.H4(prop['title'], style={
-                            'fontSize': '15px',
-                            'fontWeight': '600',
-                            'color': self.COLORS['text_primary'],
-                            'marginBottom': '8px',
-                            'lineHeight': '1.4',
-                            'height': '42px',
-                            'overflow': 'hidden'
-                        }),
+                        html.H4(prop['title'], style=self.RESULT_TITLE_STYLE),
                         
                         html.Div([
                             DashIconify(icon="mdi:map-marker", width=14, color=self.COLORS['text_secondary']),
-                            html.Span(prop['city'], style={
-                                'fontSize': '13px',
-                                'color': self.COLORS['text_secondary'],
-                                'marginLeft': '4px'
-                            })
-                        ], style={'marginBottom': '12px'}),
+                            html.Span(prop['city'], style=self.RESULT_CITY_STYLE)
+                        ], style=self.RESULT_CITY_ROW_STYLE),
                         
                         html.Div([
                             html.Div([
                                 DashIconify(icon="mdi:bed", width=16, color=self.COLORS['text_secondary']),
-                                html.Span(f"{prop['bedrooms']}" if prop['bedrooms'] > 0 else "N/A", style={
-                                    'fontSize': '12px',
-                                    'marginLeft': '4px'
-                                })
-                            ], style={'marginRight': '12px'}),
+                                html.Span(f"{prop['bedrooms']}" if prop['bedrooms'] > 0 else "N/A", style=self.SPEC_TEXT_STYLE)
+                            ], style=self.SPEC_ITEM_STYLE),
                             html.Div([
                                 DashIconify(icon="mdi:shower", width=16, color=self.COLORS['text_secondary']),
-                                html.Span(f"{prop['bathrooms']}" if prop['bathrooms'] > 0 else "N/A", style={
-                                    'fontSize': '12px',
-                                    'marginLeft': '4px'
-                                })
-                            ], style={'marginRight': '12px'}),
+                                html.Span(f"{prop['bathrooms']}" if prop['bathrooms'] > 0 else "N/A", style=self.SPEC_TEXT_STYLE)
+                            ], style=self.SPEC_ITEM_STYLE),
                             html.Div([
                                 DashIconify(icon="mdi:ruler-square", width=16, color=self.COLORS['text_secondary']),
-                                html.Span(f"{prop['surface_area']:.0f}m²" if prop['surface_area'] else "N/A", style={
-                                    'fontSize': '12px',
-                                    'marginLeft': '4px'
-                                })
+                                html.Span(f"{prop['surface_area']:.0f}m²" if prop['surface_area'] else "N/A", style=self.SPEC_TEXT_STYLE)
                             ])
-                        ], style={
-                            'display': 'flex',
-                            'marginBottom': '16px',
-                            'paddingBottom': '16px',
-                            'borderBottom': f'1px solid {self.COLORS["border"]}'
-                        }),
+                        ], style=self.SPECS_ROW_STYLE),
                         
                         html.Div([
-                            html.Span(f"{prop['price']/1_000_000:.1f}M", style={
-                                'fontSize': '22px',
-                                'fontWeight': '800',
-                                'color': self.COLORS['primary']
-                            }),
-                            html.Span(" FCFA" + (" /mois" if prop['status'] == 'Location' else ""), style={
-                                'fontSize': '13px',
-                                'color': self.COLORS['text_secondary'],
-                                'marginLeft': '4px'
-                            })
+                            html.Span(f"{prop['price']/1_000_000:.1f}M", style=self.RESULT_PRICE_STYLE),
+                            html.Span(" FCFA" + (" /mois" if prop['status'] == 'Location' else ""), style=self.RESULT_PRICE_UNIT_STYLE)
                         ])
-                    ], style={'padding': '16px'})
-                ], className='property-card', style={
-                    'background': 'white',
-                    'borderRadius': '16px',
-                    'boxShadow': '0 2px 8px rgba(0,0,0,0.08)',
-                    'overflow': 'hidden'
-                })
+                    ], style=self.RESULT_BODY_STYLE)
+                ], className='property-card', style=self.RESULT_CARD_STYLE)
                 
                 cards.append(card)
             
@@ -1,7 +1,7 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Date, Boolean, ForeignKey, Index, Numeric, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Date, Boolean, ForeignKey, Index, Numeric, JSON, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
@@ -316,6 +316,13 @@ class CoinAfrique(db.Model):
     adresse = Column(String(100))
     property_type = Column(String(100))
     
+    # Index pour les requêtes filtrées du dashboard (type + prix, date de collecte)
+    __table_args__ = (
+        Index('ix_coinafrique_ptype_price', 'property_type', 'price'),
+        Index('ix_coinafrique_price_valid', 'price', postgresql_where=text('price > 10000')),
+        Index('ix_coinafrique_scraped_at', 'scraped_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -360,6 +367,13 @@ class ExpatDakarProperty(db.Model):
     property_type = Column(String(100))
     member_since = Column(String(50))
     
+    # Index pour les requêtes filtrées du dashboard (type + prix, date de collecte)
+    __table_args__ = (
+        Index('ix_expat_dakar_ptype_price', 'property_type', 'price'),
+        Index('ix_expat_dakar_price_valid', 'price', postgresql_where=text('price > 10000')),
+        Index('ix_expat_dakar_scraped_at', 'scraped_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -403,6 +417,13 @@ class LogerDakarProperty(db.Model):
     property_type = Column(String(100))
     listing_id = Column(String(50))
     
+    # Index pour les requêtes filtrées du dashboard (type + prix, date de collecte)
+    __table_args__ = (
+        Index('ix_loger_dakar_ptype_price', 'property_type', 'price'),
+        Index('ix_loger_dakar_price_valid', 'price', postgresql_where=text('price > 10000')),
+        Index('ix_loger_dakar_scraped_at', 'scraped_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -10,6 +10,15 @@ import redis
 import os
 from datetime import datetime
 
+# orjson (optionnel) : sérialisation JSON rapide pour les réponses Flask et les callbacks Dash
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    from plotly.io.json import config as plotly_json_config
+    plotly_json_config.default_engine = 'orjson'
+except ImportError:
+    orjson = None
+
 # Importer les modèles et composants
 from .database.models import db, User, CoinAfrique, ExpatDakarProperty, LogerDakarProperty
 from .auth.auth import auth_bp, login_manager, hash_password
@@ -78,6 +87,19 @@ def create_dashboards_singleton(app):
     _dash_apps_initialized = True
     return _dash_apps
 
+if orjson is not None:
+    class OrjsonJSONProvider(DefaultJSONProvider):
+        """jsonify via orjson : tableaux NumPy et clés non-str sérialisés nativement"""
+        
+        def dumps(self, obj, **kwargs):
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
 # =============================================================================
 # FACTORY APP - CRÉATION DE L'APPLICATION PRINCIPALE
 # =============================================================================
@@ -100,6 +122,9 @@ def create_app():
     }
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-tres-securise')
 
+    if orjson is not None:
+        app.json = OrjsonJSONProvider(app)
+
     # Initialiser les extensions
     CORS(app)
     db.init_app(app)
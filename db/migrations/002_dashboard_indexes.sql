@@ -0,0 +1,20 @@
+-- 002_dashboard_indexes.sql
+-- Index pour les requêtes du dashboard (filtre prix + type de bien) sur les tables Scrapy
+-- Run with: psql "$DATABASE_URL" -f db/migrations/002_dashboard_indexes.sql
+
+-- 1) Filtre type de bien + plage de prix
+CREATE INDEX IF NOT EXISTS ix_coinafrique_ptype_price ON coinafrique (property_type, price);
+CREATE INDEX IF NOT EXISTS ix_expat_dakar_ptype_price ON expat_dakar_properties (property_type, price);
+CREATE INDEX IF NOT EXISTS ix_loger_dakar_ptype_price ON loger_dakar_properties (property_type, price);
+
+-- 2) Index partiel : seules les annonces au prix exploitable (même seuil que le dashboard)
+CREATE INDEX IF NOT EXISTS ix_coinafrique_price_valid ON coinafrique (price) WHERE price > 10000;
+CREATE INDEX IF NOT EXISTS ix_expat_dakar_price_valid ON expat_dakar_properties (price) WHERE price > 10000;
+CREATE INDEX IF NOT EXISTS ix_loger_dakar_price_valid ON loger_dakar_properties (price) WHERE price > 10000;
+
+-- 3) Rafraîchir les statistiques du planificateur
+ANALYZE coinafrique;
+ANALYZE expat_dakar_properties;
+ANALYZE loger_dakar_properties;
+
+-- End of script
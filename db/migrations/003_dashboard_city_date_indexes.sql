@@ -0,0 +1,21 @@
+-- 003_dashboard_city_date_indexes.sql
+-- Index complémentaires pour le dashboard : filtre ville (ILIKE '%ville%') et tendances par date
+-- Run with: psql "$DATABASE_URL" -f db/migrations/003_dashboard_city_date_indexes.sql
+
+-- 1) Date de collecte (fenêtres de tendance des KPIs)
+CREATE INDEX IF NOT EXISTS ix_coinafrique_scraped_at ON coinafrique (scraped_at);
+CREATE INDEX IF NOT EXISTS ix_expat_dakar_scraped_at ON expat_dakar_properties (scraped_at);
+CREATE INDEX IF NOT EXISTS ix_loger_dakar_scraped_at ON loger_dakar_properties (scraped_at);
+
+-- 2) Filtre ville en ILIKE '%...%' : un B-tree ne sert pas (joker en tête), un index trigramme oui
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_coinafrique_city_trgm ON coinafrique USING gin (city gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_expat_dakar_city_trgm ON expat_dakar_properties USING gin (city gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_loger_dakar_city_trgm ON loger_dakar_properties USING gin (city gin_trgm_ops);
+
+-- 3) Rafraîchir les statistiques du planificateur
+ANALYZE coinafrique;
+ANALYZE expat_dakar_properties;
+ANALYZE loger_dakar_properties;
+
+-- End of script
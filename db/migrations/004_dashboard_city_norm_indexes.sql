@@ -0,0 +1,16 @@
+-- 004_dashboard_city_norm_indexes.sql
+-- Index d'expression pour le filtre ville normalisée des dashboards : lower(split_part(city, ',', 1)) IN (...)
+-- (ni le B-tree ni l'index trigramme sur city ne servent pour cette expression)
+-- Run with: psql "$DATABASE_URL" -f db/migrations/004_dashboard_city_norm_indexes.sql
+
+-- 1) Ville normalisée (minuscules, partie avant la virgule) : même expression que city_column côté dashboards
+CREATE INDEX IF NOT EXISTS ix_coinafrique_city_norm ON coinafrique ((lower(split_part(city, ',', 1))));
+CREATE INDEX IF NOT EXISTS ix_expat_dakar_city_norm ON expat_dakar_properties ((lower(split_part(city, ',', 1))));
+CREATE INDEX IF NOT EXISTS ix_loger_dakar_city_norm ON loger_dakar_properties ((lower(split_part(city, ',', 1))));
+
+-- 2) Rafraîchir les statistiques du planificateur (statistiques propres aux index d'expression)
+ANALYZE coinafrique;
+ANALYZE expat_dakar_properties;
+ANALYZE loger_dakar_properties;
+
+-- End of script
@@ -44,6 +44,15 @@ raw_env = [
 def when_ready(server):
     server.log.info("Server is ready. Spawning workers")
 
+def post_fork(server, worker):
+    # Connexions SQLAlchemy héritées du maître (preload_app) : non partageables entre process.
+    # close=False : on oublie le pool hérité sans fermer les connexions encore utilisées par le maître.
+    from app.main import app
+    from app.database.models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
+    worker.log.info("Worker %s: pool SQLAlchemy réinitialisé après fork", worker.pid)
+
 def worker_int(worker):
     worker.log.info("worker received INT or QUIT signal")
 
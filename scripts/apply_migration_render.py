@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Run DB migration file in environments that may not have `psql`.
+"""Run DB migration files in environments that may not have `psql`.
 
 Usage on Render (open Shell for your Web Service in Render):
   python3 scripts/apply_migration_render.py
@@ -19,23 +19,23 @@ def main():
         print("On Render the variable is set in Environment > Environment Variables for the service.")
         sys.exit(2)
 
-    migration_path = pathlib.Path(__file__).resolve().parents[1] / 'db' / 'migrations' / '001_fix_schema.sql'
-    if not migration_path.exists():
-        print(f"ERROR: migration file not found: {migration_path}")
+    migrations_dir = pathlib.Path(__file__).resolve().parents[1] / 'db' / 'migrations'
+    migration_paths = sorted(migrations_dir.glob('*.sql'))
+    if not migration_paths:
+        print(f"ERROR: no migration file found in: {migrations_dir}")
         sys.exit(3)
 
-    sql = migration_path.read_text()
-
     try:
         conn = psycopg2.connect(database_url)
         # Run each top-level statement in autocommit so we don't inherit aborted transactions
         conn.autocommit = True
         cur = conn.cursor()
-        print(f"Applying migration: {migration_path}")
-        cur.execute(sql)
+        for migration_path in migration_paths:
+            print(f"Applying migration: {migration_path}")
+            cur.execute(migration_path.read_text())
         cur.close()
         conn.close()
-        print("Migration applied successfully.")
+        print("Migrations applied successfully.")
     except Exception as e:
         print("Migration failed:", e)
         sys.exit(4)
@@ -0,0 +1,20 @@
+"""
+🧪 TESTS DE FUMÉE
+Vérifie que le paquet des dashboards s'importe (erreurs de portée dans les corps de classe, imports cassés...)
+"""
+
+import importlib
+
+import pytest
+
+
+def test_import_dashboards():
+    """Le paquet app.dashboards (et ses dashboards) s'importe sans erreur"""
+    # Dépendances lourdes absentes : environnement incomplet, pas une régression du code
+    for module in ('dash', 'pandas', 'numpy', 'plotly', 'sqlalchemy'):
+        pytest.importorskip(module)
+    
+    dashboards = importlib.import_module('app.dashboards')
+    
+    assert dashboards.AnalyticsDashboard.TYPE_PALETTE
+    assert len(dashboards.AnalyticsDashboard.TYPE_PALETTE_FILL) == len(dashboards.AnalyticsDashboard.TYPE_PALETTE)